@@ -0,0 +1,87 @@
+"""get_current_user용 프로세스 로컬 TTL 캐시
+
+검증된 토큰 → student_pk, student_pk → 인증 주체 필드를 캐시해 인증 경로의 DB 조회를 없앤다.
+학생 정보·비밀번호가 바뀌면 invalidate_principal로 즉시 무효화하며, 다른 워커 프로세스에는
+TTL이 지나야 반영된다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from auth.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS
+
+PRINCIPAL_FIELDS = ("student_pk", "student_id", "name", "grade", "role", "status")
+
+
+class TTLCache:
+    """만료 시각과 크기 상한(LRU 제거)을 가진 스레드 안전 캐시"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key: Hashable):
+        """적중/미스 횟수와 LRU 순서에 영향을 주지 않는 조회"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, value, ttl_seconds: float | None = None) -> None:
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+token_cache = TTLCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_SIZE)
+principal_cache = TTLCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_SIZE)
+
+
+def invalidate_principal(student_pk: int) -> None:
+    principal_cache.pop(student_pk)
@@ -1,17 +1,24 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from auth.cache import PRINCIPAL_FIELDS, principal_cache, token_cache
 from auth.security import decode_access_token
-from db.models import Student, get_db
+from db.models import Student
+from db.session import get_session, open_primary_session, run_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> Student:
+def _resolve_token(token: str) -> int:
+    """검증된 토큰은 캐시에서 student_pk를 꺼내고, 처음 보는 토큰만 서명을 검증"""
+    student_pk = token_cache.get(token)
+    if student_pk is not None:
+        return student_pk
+
     try:
         payload = decode_access_token(token)
         student_pk: int = payload.get("sub")
@@ -24,13 +31,48 @@ def get_current_user(
         print(f"[AUTH DEBUG] token (first 50 chars): {token[:50] if token else 'None'}")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰입니다.")
 
+    # 토큰 만료 시각을 넘겨 캐시하지 않음
+    token_cache.set(token, student_pk, ttl_seconds=payload["exp"] - time.time())
+    return student_pk
+
+
+def _load_principal(db: Session, student_pk: int) -> dict | None:
     user = db.query(Student).filter(Student.student_pk == student_pk).first()
     if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="사용자를 찾을 수 없습니다.")
-    return user
+        return None
+    return {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+
+
+async def _authenticate(token: str, db: Session | AsyncSession) -> Student:
+    student_pk = _resolve_token(token)
+
+    principal = principal_cache.get(student_pk)
+    if principal is None:
+        principal = await run_service(db, _load_principal, student_pk)
+        if principal is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="사용자를 찾을 수 없습니다.")
+        principal_cache.set(student_pk, principal)
+
+    # 세션에 속하지 않은 사본을 반환해 요청 간 공유 객체가 변경되지 않도록 함
+    return Student(**principal)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session | AsyncSession = Depends(get_session),
+) -> Student:
+    return await _authenticate(token, db)
+
+
+async def get_stream_user(
+    token: str = Query(description="액세스 토큰 (EventSource는 Authorization 헤더를 보낼 수 없음)"),
+) -> Student:
+    """스트리밍 응답용 인증: 연결이 열려 있는 동안 DB 커넥션을 잡지 않도록 인증에만 세션을 쓰고 바로 닫음"""
+    async with open_primary_session() as db:
+        return await _authenticate(token, db)
 
 
-def require_admin(current_user: Student = Depends(get_current_user)) -> Student:
+async def require_admin(current_user: Student = Depends(get_current_user)) -> Student:
     if current_user.role != "관리자":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
     return current_user
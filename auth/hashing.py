@@ -0,0 +1,63 @@
+"""bcrypt 해시/검증을 전용 프로세스 풀에서 실행하는 비동기 API
+
+bcrypt는 요청마다 수백 ms의 CPU를 쓰므로 AnyIO 스레드풀 대신 크기가 제한된 프로세스 풀에서
+돌린다. 처리 중인 작업이 PASSWORD_HASH_QUEUE_LIMIT에 도달하면 대기열에 쌓지 않고 즉시 503을 반환한다.
+풀은 앱 lifespan에서 만들며, 이벤트 루프·DB 연결·스레드를 가진 프로세스를 fork하지 않도록
+forkserver(없으면 spawn)로 워커를 띄운다.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
+
+from auth.config import PASSWORD_HASH_QUEUE_LIMIT, PASSWORD_HASH_WORKERS
+from auth.security import hash_password, verify_password
+
+_executor: ProcessPoolExecutor | None = None
+# 이벤트 루프 스레드에서만 증감하므로 별도 잠금이 필요 없음
+_in_flight = 0
+
+
+def start_password_pool() -> None:
+    global _executor
+    if _executor is None:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context(start_method),
+        )
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def _run_in_pool(func, *args):
+    global _in_flight
+    if _in_flight >= PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=503,
+            detail="로그인 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+    if _executor is None:
+        raise RuntimeError("비밀번호 해시 프로세스 풀이 시작되지 않았습니다. start_password_pool()을 먼저 호출하세요.")
+
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
@@ -0,0 +1,70 @@
+"""자동 배정 엔진(greedy / optimal) 속도와 배정 편차 비교
+
+사용법: python -m benchmarks.assignment_engines
+"""
+import random
+import time
+from types import SimpleNamespace
+
+from services.assignments_service import _format_schedule_plan, _plan_term
+
+SEAT_TARGETS = (1_000, 10_000, 100_000)
+STUDENTS_PER_GRADE = 150
+AREAS = [
+    SimpleNamespace(area_id=1, name="1학년 교실", need_peoples=4, target_grades=[1]),
+    SimpleNamespace(area_id=2, name="2학년 교실", need_peoples=4, target_grades=[2]),
+    SimpleNamespace(area_id=3, name="3학년 교실", need_peoples=4, target_grades=[3]),
+    SimpleNamespace(area_id=4, name="복도", need_peoples=3, target_grades=[1, 2]),
+    SimpleNamespace(area_id=5, name="계단", need_peoples=3, target_grades=[2, 3]),
+    SimpleNamespace(area_id=6, name="가습기", need_peoples=2, target_grades=[3]),
+]
+SEATS_PER_SCHEDULE = sum(area.need_peoples for area in AREAS)
+
+
+def _run(engine: str, seat_target: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    student_pks_by_grade = {
+        grade: list(range(grade * 1000, grade * 1000 + STUDENTS_PER_GRADE)) for grade in (1, 2, 3)
+    }
+    # 기존 이력이 고르지 않은 상태에서 출발
+    fairness_counts = {
+        student_pk: rng.randint(0, 3) for student_pks in student_pks_by_grade.values() for student_pk in student_pks
+    }
+    schedule_ids = list(range(1, seat_target // SEATS_PER_SCHEDULE + 1))
+
+    started_at = time.perf_counter()
+    term_plan = _plan_term(schedule_ids, AREAS, student_pks_by_grade, dict(fairness_counts), engine, rng)
+    elapsed = time.perf_counter() - started_at
+
+    loads = dict(fairness_counts)
+    seat_count = 0
+    unfilled_count = 0
+    for schedule_id in schedule_ids:
+        planned_assignments, unfilled_needs = _format_schedule_plan(schedule_id, AREAS, term_plan[schedule_id])
+        seat_count += len(planned_assignments)
+        unfilled_count += sum(need["missing_count"] for need in unfilled_needs)
+        for row in planned_assignments:
+            loads[row["student_pk"]] += 1
+
+    return {
+        "engine": engine,
+        "seats": seat_count,
+        "unfilled": unfilled_count,
+        "seconds": elapsed,
+        "spread": max(loads.values()) - min(loads.values()),
+    }
+
+
+def main() -> None:
+    print(f"{'engine':<8} {'seats':>8} {'unfilled':>8} {'seconds':>9} {'max-min':>8}")
+    for seat_target in SEAT_TARGETS:
+        for engine in ("greedy", "optimal"):
+            result = _run(engine, seat_target, seed=seat_target)
+            print(
+                f"{result['engine']:<8} {result['seats']:>8} {result['unfilled']:>8} "
+                f"{result['seconds']:>9.3f} {result['spread']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""배정 목록 응답 직렬화 비용 비교 (ORM 객체 + jsonable_encoder + JSONResponse vs 컬럼 조회 + response_model + ORJSONResponse)
+
+SQLite 메모리 DB에 배정 행을 채운 뒤, 조회부터 응답 바이트 생성까지를 두 경로로 반복 측정한다.
+
+사용법: python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# limit 없는 전체 목록 경로를 재므로 행 수 상한을 풂
+os.environ.setdefault("MAX_UNPAGED_ROWS", "1000000")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from db import models  # noqa: E402
+from db.schemas import Assignment  # noqa: E402
+from services import assignments_service  # noqa: E402
+
+ASSIGNMENT_LIST = TypeAdapter(list[Assignment])
+
+
+def _seed(row_count: int) -> None:
+    models.init_db()
+    db = models.SessionLocal()
+    try:
+        db.add(models.Area(area_id=1, name="복도", need_peoples=4, target_grades=[1, 2, 3]))
+        db.execute(
+            models.Assignment.__table__.insert(),
+            [
+                {"schedule_id": index // 20 + 1, "student_pk": index % 500 + 1, "area_id": 1, "status": "배정"}
+                for index in range(row_count)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _orm_json_response() -> bytes:
+    db = models.SessionLocal()
+    try:
+        assignments = db.query(models.Assignment).order_by(models.Assignment.assignment_id).all()
+        return JSONResponse(jsonable_encoder(assignments)).body
+    finally:
+        db.close()
+
+
+def _column_orjson_response() -> bytes:
+    db = models.SessionLocal()
+    try:
+        rows = assignments_service.get_assignments(db)
+        # FastAPI의 response_model 검증/직렬화와 같은 단계
+        content = ASSIGNMENT_LIST.dump_python(ASSIGNMENT_LIST.validate_python(rows, from_attributes=True), mode="json")
+        return ORJSONResponse(content).body
+    finally:
+        db.close()
+
+
+def _measure(func, repeat: int) -> tuple[float, int]:
+    func()
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        body = func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings), len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _seed(args.rows)
+
+    print(f"{'path':<16} {'rows':>7} {'bytes':>9} {'best ms':>9}")
+    for label, func in (("orm+json", _orm_json_response), ("columns+orjson", _column_orjson_response)):
+        seconds, size = _measure(func, args.repeat)
+        print(f"{label:<16} {args.rows:>7} {size:>9} {seconds * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""동기(DB_ASYNC=false) / 비동기(DB_ASYNC=true) 스택의 처리량과 p99 지연 비교
+
+모드는 import 시점에 결정되므로 모드마다 하위 프로세스에서 같은 SQLite 파일 DB를 만들고,
+httpx ASGITransport로 동일한 동시 부하를 건다.
+
+사용법: python -m benchmarks.sync_vs_async [--requests 2000] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ENDPOINTS = ("/schedules/", "/areas/", "/assignments/?status=배정", "/students/names")
+
+
+def _seed(student_count: int, schedule_count: int) -> int:
+    from db.models import Area, Assignment, Schedule, SessionLocal, Student, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        admin = Student(student_id="admin", name="관리자", grade=0, status="재학", role="관리자")
+        db.add(admin)
+        students = [
+            Student(student_id=f"s{index}", name=f"학생{index}", grade=index % 3 + 1, status="재학", role="학생")
+            for index in range(student_count)
+        ]
+        db.add_all(students)
+        area = Area(name="복도", need_peoples=4, target_grades=[1, 2, 3])
+        db.add(area)
+        schedules = [
+            Schedule(cleaning_date=date(2030, 1, 1) + timedelta(days=index), status="예정")
+            for index in range(schedule_count)
+        ]
+        db.add_all(schedules)
+        db.flush()
+
+        db.add_all(
+            Assignment(
+                schedule_id=schedule.schedule_id,
+                student_pk=students[(schedule_index * 4 + seat) % student_count].student_pk,
+                area_id=area.area_id,
+                status="배정",
+            )
+            for schedule_index, schedule in enumerate(schedules)
+            for seat in range(4)
+        )
+        db.commit()
+        return admin.student_pk
+    finally:
+        db.close()
+
+
+async def _drive(request_count: int, concurrency: int, admin_pk: int) -> dict:
+    import httpx
+
+    from auth.security import create_access_token
+    from main import app
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': admin_pk, 'role': '관리자'})}"}
+    latencies: list[float] = []
+    next_index = 0
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+
+            async def worker():
+                nonlocal next_index
+                while next_index < request_count:
+                    path = ENDPOINTS[next_index % len(ENDPOINTS)]
+                    next_index += 1
+                    started_at = time.perf_counter()
+                    response = await client.get(path)
+                    latencies.append(time.perf_counter() - started_at)
+                    response.raise_for_status()
+
+            started_at = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def _run_worker(args) -> None:
+    admin_pk = _seed(student_count=300, schedule_count=200)
+    result = asyncio.run(_drive(args.requests, args.concurrency, admin_pk))
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _run_worker(args)
+        return
+
+    print(f"{'mode':<6} {'requests':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, db_async in (("sync", "false"), ("async", "true")):
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                "DB_ASYNC": db_async,
+            }
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.sync_vs_async",
+                    "--worker",
+                    "--requests",
+                    str(args.requests),
+                    "--concurrency",
+                    str(args.concurrency),
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(
+            f"{mode:<6} {result['requests']:>8} {result['rps']:>9.1f} "
+            f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""대기 교환 요청 그래프에서 순환 매칭 속도 측정
+
+사용법: python -m benchmarks.trade_cycles
+"""
+import random
+import time
+
+from services.trade_matching import RosterState, find_trade_cycles
+
+REQUEST_TARGETS = (1_000, 10_000, 50_000)
+SEATS_PER_SCHEDULE = 20
+STUDENT_COUNT = 2_000
+
+
+def _build_roster(assignment_count: int, rng: random.Random):
+    assignment_rows = []
+    for assignment_id in range(1, assignment_count + 1):
+        schedule_id = (assignment_id - 1) // SEATS_PER_SCHEDULE + 1
+        assignment_rows.append((assignment_id, schedule_id, rng.randrange(STUDENT_COUNT)))
+    return assignment_rows
+
+
+def _run(request_target: int, max_length: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    assignment_rows = _build_roster(request_target // 2, rng)
+    schedules = {assignment_id: schedule_id for assignment_id, schedule_id, _ in assignment_rows}
+
+    # 같은 일정끼리는 교환 요청이 만들어지지 않음
+    edges = []
+    assignment_ids = list(schedules)
+    while len(edges) < request_target:
+        requester_assignment_id, target_assignment_id = rng.sample(assignment_ids, 2)
+        if schedules[requester_assignment_id] != schedules[target_assignment_id]:
+            edges.append((len(edges) + 1, requester_assignment_id, target_assignment_id))
+
+    roster = RosterState(assignment_rows, [(schedule_id, student_pk) for _, schedule_id, student_pk in assignment_rows])
+
+    started_at = time.perf_counter()
+    cycles = find_trade_cycles(edges, max_length=max_length, accept=roster.try_rotate)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "requests": request_target,
+        "max_length": max_length,
+        "cycles": len(cycles),
+        "matched": sum(len(cycle) for cycle in cycles),
+        "seconds": elapsed,
+    }
+
+
+def main() -> None:
+    print(f"{'requests':>8} {'max_len':>7} {'cycles':>7} {'matched':>8} {'seconds':>9}")
+    for request_target in REQUEST_TARGETS:
+        for max_length in (3, 4, 5):
+            result = _run(request_target, max_length, seed=request_target)
+            print(
+                f"{result['requests']:>8} {result['max_length']:>7} {result['cycles']:>7} "
+                f"{result['matched']:>8} {result['seconds']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
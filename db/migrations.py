@@ -0,0 +1,161 @@
+"""버전 기반 스키마 마이그레이션
+
+schema_version 테이블에 적용된 마지막 버전을 기록하고, 그보다 큰 버전의 단계만 순서대로
+실행한다. 최신 상태라면 버전 조회만 하고 끝나므로 워커 기동 비용이 테이블 수와 무관하다.
+MySQL에서는 GET_LOCK 이름 잠금으로 한 워커만 마이그레이션을 실행하고, 나머지 워커는 잠금을 기다린 뒤
+버전을 다시 확인한다. SQLite는 단일 프로세스 로컬 개발용이므로 잠그지 않는다.
+각 단계는 도중에 실패해 다시 실행되어도 되도록 멱등하게 작성한다.
+"""
+import json
+import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Column, Integer, MetaData, Table, delete, func, insert, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+MIGRATION_LOCK_NAME = "cleaning.schema_migrations"
+MIGRATION_LOCK_TIMEOUT_SECONDS = int(os.getenv("MIGRATION_LOCK_TIMEOUT_SECONDS", "300"))
+
+_version_metadata = MetaData()
+schema_version_table = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, nullable=False),
+)
+
+
+def _add_legacy_columns(connection: Connection, _: MetaData) -> None:
+    inspector = inspect(connection)
+    schedule_columns = {column["name"] for column in inspector.get_columns("schedules")}
+    student_columns = {column["name"] for column in inspector.get_columns("students")}
+
+    if "status" not in schedule_columns:
+        connection.execute(text("ALTER TABLE schedules ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT '예정'"))
+    connection.execute(text("UPDATE schedules SET status = '예정' WHERE status IS NULL"))
+
+    if "password_hash" not in student_columns:
+        connection.execute(text("ALTER TABLE students ADD COLUMN password_hash VARCHAR(128)"))
+
+
+def _create_model_indexes(connection: Connection, metadata: MetaData) -> None:
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _rebuild_assignment_stats(connection: Connection, _: MetaData) -> None:
+    from services.assignment_stats_service import rebuild_assignment_stats
+
+    rebuild_assignment_stats(Session(bind=connection))
+
+
+def _normalize_area_target_grades(connection: Connection, _: MetaData) -> None:
+    area_columns = {column["name"] for column in inspect(connection).get_columns("areas")}
+    if "target_grades" not in area_columns:
+        return
+
+    existing_links = set(connection.execute(text("SELECT area_id, grade FROM area_target_grades")).all())
+    links = []
+    for area_id, raw_target_grades in connection.execute(text("SELECT area_id, target_grades FROM areas")).all():
+        target_grades = json.loads(raw_target_grades) if isinstance(raw_target_grades, str) else raw_target_grades
+        for grade in sorted({int(grade) for grade in target_grades or []}):
+            if (area_id, grade) not in existing_links:
+                links.append({"area_id": area_id, "grade": grade})
+
+    if links:
+        connection.execute(text("INSERT INTO area_target_grades (area_id, grade) VALUES (:area_id, :grade)"), links)
+    connection.execute(text("ALTER TABLE areas DROP COLUMN target_grades"))
+
+
+def _seed_table_versions(connection: Connection, _: MetaData) -> None:
+    from db.models import TableVersion
+    from db.table_versions import CHANGE_LOG_KEY, VERSION_KEYS
+
+    existing_keys = set(connection.execute(select(TableVersion.table_name)).scalars())
+    missing_rows = [
+        {"table_name": key, "version": 0} for key in (*VERSION_KEYS, CHANGE_LOG_KEY) if key not in existing_keys
+    ]
+    if missing_rows:
+        connection.execute(insert(TableVersion), missing_rows)
+
+
+def _sequence_change_log(connection: Connection, metadata: MetaData) -> None:
+    """change_log.version을 테이블별 버전에서 전체 커밋 순번으로 바꿈
+
+    이전에는 change_id가 커밋 순서였으므로 기존 기록의 순번은 change_id로 두고, 이후 순번과 엔티티 버전은
+    기존 어떤 버전 값보다 크게 시작해 예전 ETag와 겹치지 않게 한다.
+    """
+    from db.models import ChangeLog, TableVersion
+
+    _create_model_indexes(connection, metadata)
+    start = max(
+        connection.execute(select(func.max(ChangeLog.change_id))).scalar() or 0,
+        connection.execute(select(func.max(TableVersion.version))).scalar() or 0,
+    )
+    connection.execute(update(ChangeLog).values(version=ChangeLog.change_id))
+    _seed_table_versions(connection, metadata)
+    connection.execute(update(TableVersion).values(version=start))
+
+
+# (버전, 설명, 단계) — 새 단계는 항상 마지막에 다음 버전 번호로 추가
+MIGRATIONS: list[tuple[int, str, Callable[[Connection, MetaData], None]]] = [
+    (1, "schedules.status / students.password_hash 컬럼 추가", _add_legacy_columns),
+    (2, "배정·교환·일정 조회용 복합 인덱스 생성", _create_model_indexes),
+    (3, "학생별 배정 집계 원장 채우기", _rebuild_assignment_stats),
+    (4, "areas.target_grades JSON을 area_target_grades 테이블로 정규화", _normalize_area_target_grades),
+    (5, "학생별 교환 조회용 trades 배정 ID 인덱스 생성", _create_model_indexes),
+    (6, "ETag용 테이블 버전 카운터 행 생성", _seed_table_versions),
+    (7, "change_log 테이블과 변경 기록 순번 행 생성", _seed_table_versions),
+    (8, "change_log 순번을 커밋 뒤에 매기도록 전환하고 순번 인덱스 생성", _sequence_change_log),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _get_current_version(connection: Connection) -> int:
+    return connection.execute(select(schema_version_table.c.version)).scalar() or 0
+
+
+@contextmanager
+def _migration_lock(engine: Engine) -> Iterator[None]:
+    if engine.dialect.name != "mysql":
+        yield
+        return
+
+    # 이름 잠금은 트랜잭션이 아니라 연결에 묶이므로 마이그레이션이 끝날 때까지 이 연결을 유지
+    with engine.connect() as connection:
+        acquired = connection.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT_SECONDS},
+        ).scalar()
+        if acquired != 1:
+            raise RuntimeError(f"마이그레이션 잠금을 {MIGRATION_LOCK_TIMEOUT_SECONDS}초 안에 얻지 못했습니다.")
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+
+
+def run_migrations(engine: Engine, metadata: MetaData) -> int:
+    with _migration_lock(engine):
+        with engine.begin() as connection:
+            schema_version_table.create(connection, checkfirst=True)
+            current_version = _get_current_version(connection)
+
+        if current_version >= LATEST_VERSION:
+            return current_version
+
+        metadata.create_all(bind=engine)
+
+        for version, _, migrate in MIGRATIONS:
+            if version <= current_version:
+                continue
+
+            with engine.begin() as connection:
+                migrate(connection, metadata)
+                connection.execute(delete(schema_version_table))
+                connection.execute(insert(schema_version_table).values(version=version))
+            current_version = version
+
+        return current_version
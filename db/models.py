@@ -3,8 +3,11 @@ from __future__ import annotations
 import os
 from urllib.parse import quote_plus
 
-from sqlalchemy import JSON, Column, Date, ForeignKey, Integer, String, create_engine, inspect, text
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+
+from db.pool_metrics import InstrumentedQueuePool
 
 
 def _build_database_url() -> str:
@@ -27,10 +30,34 @@ def _build_database_url() -> str:
 
 DATABASE_URL = _build_database_url()
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true",
-)
+# 커넥션 풀 설정 (uvicorn 스레드풀 크기에 맞춰 조정, recycle은 MySQL wait_timeout보다 짧게)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+def _build_engine_options(database_url: str, poolclass: type = InstrumentedQueuePool) -> dict:
+    options = {"echo": os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"}
+
+    # 메모리 SQLite는 드라이버 기본 풀(단일 커넥션)을 그대로 사용
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_build_engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -47,17 +74,45 @@ class Student(Base):
     password_hash = Column(String(128), nullable=True)
 
 
+class AreaTargetGrade(Base):
+    __tablename__ = "area_target_grades"
+    __table_args__ = (Index("ix_area_target_grades_grade_area_id", "grade", "area_id"),)
+
+    area_id = Column(Integer, ForeignKey("areas.area_id", ondelete="CASCADE"), primary_key=True)
+    grade = Column(Integer, primary_key=True)
+
+
 class Area(Base):
     __tablename__ = "areas"
 
     area_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String(50), unique=True, nullable=False)
     need_peoples = Column(Integer, nullable=False)
-    target_grades = Column(JSON, nullable=False)
+    grade_links = relationship(
+        AreaTargetGrade,
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by=AreaTargetGrade.grade,
+    )
+
+    @property
+    def target_grades(self) -> list[int]:
+        return [link.grade for link in self.grade_links]
+
+    @target_grades.setter
+    def target_grades(self, grades: list[int]) -> None:
+        # 유지되는 학년의 행은 그대로 두고, 빠진 학년만 삭제·새 학년만 추가
+        wanted_grades = set(grades)
+        kept_links = [link for link in self.grade_links if link.grade in wanted_grades]
+        kept_grades = {link.grade for link in kept_links}
+        self.grade_links = kept_links + [
+            AreaTargetGrade(grade=grade) for grade in sorted(wanted_grades - kept_grades)
+        ]
 
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (Index("ix_schedules_status_cleaning_date", "status", "cleaning_date"),)
 
     schedule_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     cleaning_date = Column(Date, unique=True, nullable=False)
@@ -66,6 +121,10 @@ class Schedule(Base):
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        Index("ix_assignments_schedule_id_status", "schedule_id", "status"),
+        Index("ix_assignments_student_pk_status", "student_pk", "status"),
+    )
 
     assignment_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     schedule_id = Column(Integer, ForeignKey("schedules.schedule_id"), nullable=False)
@@ -76,27 +135,52 @@ class Assignment(Base):
 
 class Trade(Base):
     __tablename__ = "trades"
+    __table_args__ = (
+        Index("ix_trades_status_requester_assignment_id", "status", "requester_assignment_id"),
+        Index("ix_trades_status_target_assignment_id", "status", "target_assignment_id"),
+    )
 
     request_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    requester_assignment_id = Column(Integer, ForeignKey("assignments.assignment_id"), nullable=False)
-    target_assignment_id = Column(Integer, ForeignKey("assignments.assignment_id"), nullable=False)
+    requester_assignment_id = Column(Integer, ForeignKey("assignments.assignment_id"), nullable=False, index=True)
+    target_assignment_id = Column(Integer, ForeignKey("assignments.assignment_id"), nullable=False, index=True)
     status = Column(String(10), nullable=False, default="대기")
 
 
-def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
+class StudentAssignmentStats(Base):
+    __tablename__ = "student_assignment_stats"
+
+    student_pk = Column(Integer, ForeignKey("students.student_pk"), primary_key=True)
+    cleaning_count = Column(Integer, nullable=False, default=0)
+    noncompliance_count = Column(Integer, nullable=False, default=0)
+    penalty_count = Column(Integer, nullable=False, default=0)
 
-    inspector = inspect(engine)
-    schedule_columns = {column["name"] for column in inspector.get_columns("schedules")}
-    student_columns = {column["name"] for column in inspector.get_columns("students")}
 
-    with engine.begin() as connection:
-        if "status" not in schedule_columns:
-            connection.execute(text("ALTER TABLE schedules ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT '예정'"))
-        connection.execute(text("UPDATE schedules SET status = '예정' WHERE status IS NULL"))
+class TableVersion(Base):
+    """테이블별 쓰기 버전 (ETag 계산용, 쓰기 트랜잭션 커밋 시 1씩 증가)"""
 
-        if "password_hash" not in student_columns:
-            connection.execute(text("ALTER TABLE students ADD COLUMN password_hash VARCHAR(128)"))
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class ChangeLog(Base):
+    """서비스 쓰기로 바뀐 엔티티 기록 (증분 동기화용, 추가만 함)"""
+
+    __tablename__ = "change_log"
+    __table_args__ = (Index("ix_change_log_version", "version"),)
+
+    change_id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=True)  # None이면 테이블 전체가 바뀜 (다시 조회 필요)
+    op = Column(String(10), nullable=False)  # upsert / delete / reset
+    version = Column(Integer, nullable=False)  # 커밋 순번 (0이면 아직 순번을 매기지 않음, 커서로 사용)
+
+
+def init_db() -> None:
+    from db.migrations import run_migrations
+
+    run_migrations(engine, Base.metadata)
 
 
 def get_db():
@@ -105,3 +189,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 쓰기 시 테이블 버전을 올리는 세션 이벤트 등록
+from db import table_versions  # noqa: E402,F401
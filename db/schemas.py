@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Literal
+from typing import Generic, Literal, TypeVar
 
 from pydantic import BaseModel
 
@@ -38,6 +38,8 @@ class StudentUpdate(BaseModel):
 
 # 청소 구역
 class Area(BaseModel):
+    model_config = {"from_attributes": True}
+
     area_id: int
     name: str
     need_peoples: int
@@ -59,6 +61,8 @@ class AreaUpdate(BaseModel):
 
 # 스케쥴
 class Schedule(BaseModel):
+    model_config = {"from_attributes": True}
+
     schedule_id: int
     cleaning_date: date
     status: Literal["예정", "완료", "취소"] = "예정"
@@ -71,6 +75,8 @@ class ScheduleUpdate(BaseModel):
 
 # 청소 배정
 class Assignment(BaseModel):
+    model_config = {"from_attributes": True}
+
     assignment_id: int
     schedule_id: int
     student_pk: int
@@ -80,6 +86,8 @@ class Assignment(BaseModel):
 
 # 청소 교환
 class Trade(BaseModel):
+    model_config = {"from_attributes": True}
+
     request_id: int
     requester_assignment_id: int
     target_assignment_id: int
@@ -110,3 +118,201 @@ class TokenResponse(BaseModel):
 class SetPasswordRequest(BaseModel):
     current_password: str | None = None
     new_password: str
+
+
+# --------응답 모델--------
+
+
+class MessageResponse(BaseModel):
+    message: str
+
+
+ItemT = TypeVar("ItemT")
+
+
+# 목록 조회 페이지 (limit을 준 경우)
+class Page(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    total: int  # 캐시된 전체 개수 (근사치)
+    has_more: bool
+    next_after: int | None = None  # 다음 페이지 조회 시 after 값
+
+
+# 학생 응답
+class StudentCreateResponse(MessageResponse):
+    student_id: str
+    student: Student
+
+
+class StudentUpdateResponse(MessageResponse):
+    student: Student
+    canceled_assignments: list[int]
+
+
+# 청소 구역 응답
+class AreaResponse(MessageResponse):
+    area: Area
+
+
+# 일정 응답
+class ScheduleCreateResponse(MessageResponse):
+    created_count: int
+    weekdays: list[int]
+    schedules: list[Schedule]
+
+
+class ScheduleUpdateResponse(MessageResponse):
+    schedule: Schedule
+    canceled_assignment_count: int
+    canceled_trade_count: int
+
+
+class ScheduleDeleteResponse(MessageResponse):
+    deleted_assignment_count: int
+    deleted_trade_count: int
+
+
+class ScheduleDeleteAllResponse(ScheduleDeleteResponse):
+    deleted_schedule_count: int
+
+
+# 배정 응답
+class PlannedAssignment(BaseModel):
+    model_config = {"from_attributes": True}
+
+    schedule_id: int
+    student_pk: int
+    area_id: int
+    status: str = "배정"
+
+
+class UnfilledNeed(BaseModel):
+    schedule_id: int
+    area_id: int
+    area_name: str
+    required_count: int
+    assigned_count: int
+    missing_count: int
+
+
+class ScheduleAssignmentResult(BaseModel):
+    schedule_id: int
+    created_count: int
+    # 미리보기(dry_run)는 저장 전이라 assignment_id가 없음
+    assignments: list[Assignment | PlannedAssignment]
+    unfilled_needs: list[UnfilledNeed]
+
+
+class AssignmentRunResponse(MessageResponse):
+    plan_id: str | None = None
+    dry_run: bool = False
+    engine: str | None = None
+    seed: int | None = None
+    created_schedule_count: int
+    total_created_count: int
+    results: list[ScheduleAssignmentResult]
+    skipped_schedule_ids: list[int]
+    total_unfilled_needs: list[UnfilledNeed]
+
+
+class AssignmentStatusResponse(MessageResponse):
+    assignment: Assignment
+    canceled_trade_count: int
+
+
+class AssignmentReassignResponse(MessageResponse):
+    assignment: Assignment
+    selected_student_cleaning_count: int
+
+
+class ReassignResult(BaseModel):
+    assignment_id: int
+    schedule_id: int
+    area_id: int
+    previous_student_pk: int
+    student_pk: int | None
+    reassigned: bool
+    selected_student_cleaning_count: int | None = None
+    detail: str | None = None
+
+
+class BatchReassignResponse(MessageResponse):
+    schedule_id: int | None
+    reassigned_count: int
+    failed_count: int
+    results: list[ReassignResult]
+
+
+class AssignmentDeleteResponse(MessageResponse):
+    schedule_id: int | None = None
+    deleted_assignment_count: int
+    deleted_trade_count: int
+
+
+# 교환 응답
+class TradeResponse(MessageResponse):
+    trade: Trade
+
+
+class TradeCandidate(BaseModel):
+    assignment_id: int
+    schedule_id: int
+    cleaning_date: date
+    student_pk: int
+    student_name: str
+    area_id: int
+    area_name: str
+    status: str
+
+
+class TradeCandidatesResponse(BaseModel):
+    assignment_id: int
+    limit: int
+    offset: int
+    has_more: bool
+    items: list[TradeCandidate]
+
+
+class TradeMove(BaseModel):
+    assignment_id: int
+    from_student_pk: int
+    to_student_pk: int
+
+
+class TradeCycle(BaseModel):
+    request_ids: list[int]
+    moves: list[TradeMove]
+
+
+class TradeCycleMatchResponse(MessageResponse):
+    dry_run: bool
+    pending_count: int
+    cycles: list[TradeCycle]
+    skipped_count: int
+
+
+# 학생 대시보드 응답
+class DashboardResponse(BaseModel):
+    assignments: list[Assignment]
+    trades: list[Trade]
+    counterpart_assignments: list[Assignment]  # 내 교환 요청의 상대 배정
+    schedules: list[Schedule]
+    areas: list[Area]
+    student_names: dict[int, str]
+
+
+# 변경 피드 응답
+class ChangeSet(BaseModel):
+    students: list[Student] = []
+    areas: list[Area] = []
+    schedules: list[Schedule] = []
+    assignments: list[Assignment] = []
+    trades: list[Trade] = []
+
+
+class ChangeFeedResponse(BaseModel):
+    cursor: int  # 다음 조회의 since 값
+    has_more: bool
+    resets: list[str]  # 테이블 전체를 다시 조회해야 하는 엔티티
+    upserts: ChangeSet
+    deletes: dict[str, list[int]]
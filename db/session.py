@@ -0,0 +1,348 @@
+"""동기/비동기 DB 세션 선택과 서비스 호출 어댑터
+
+DB_ASYNC=true면 AsyncEngine/AsyncSession(aiomysql, 로컬은 aiosqlite)으로 요청을 처리하고,
+아니면 기존 동기 Session을 쓰되 서비스 호출만 스레드풀로 넘긴다. 라우터는 run_service로
+services/의 함수를 호출하므로 두 모드에서 같은 코드를 사용한다.
+
+DATABASE_REPLICA_URLS가 있으면 읽기 전용 라우트(get_read_db)는 정상 상태인 복제본을 라운드 로빈으로
+사용하고, 최근 READ_YOUR_WRITES_SECONDS 안에 쓰기를 한 사용자는 복제 지연을 피하도록 주 DB로 보낸다.
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from auth.cache import token_cache
+from db.models import DATABASE_URL, SessionLocal, _build_engine_options, engine
+from db.pool_metrics import InstrumentedAsyncAdaptedQueuePool
+from db.table_versions import (
+    cached_versions,
+    etag_matches,
+    has_unsequenced_changes,
+    load_versions,
+    make_etag,
+    remember_versions,
+    sequence_changes,
+)
+
+DbSession = Session | AsyncSession
+
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+# 읽기 전용 복제본 URL 목록 (쉼표 구분)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_HEALTH_CHECK_SECONDS = int(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5"))
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+# 커밋 뒤 순번 매기기에 실패해 남은 change_log 기록을 확인하는 간격
+CHANGE_LOG_SEQUENCE_SWEEP_SECONDS = float(os.getenv("CHANGE_LOG_SEQUENCE_SWEEP_SECONDS", "5"))
+
+# 동기 드라이버 → 비동기 드라이버
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _build_async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    ASYNC_DATABASE_URL = _build_async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **_build_engine_options(ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncAdaptedQueuePool),
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
+class _Replica:
+    def __init__(self, database_url: str):
+        self.name = make_url(database_url).render_as_string(hide_password=True)
+        self.healthy = True
+        self.last_error: str | None = None
+
+        if DB_ASYNC:
+            async_url = _build_async_database_url(database_url)
+            self.engine = create_async_engine(
+                async_url,
+                **_build_engine_options(async_url, poolclass=InstrumentedAsyncAdaptedQueuePool),
+            )
+            self.session_factory = async_sessionmaker(self.engine, autoflush=False)
+        else:
+            self.engine = create_engine(database_url, **_build_engine_options(database_url))
+            self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+    def _ping_sync(self) -> None:
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    async def check(self) -> None:
+        try:
+            if DB_ASYNC:
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            else:
+                await run_in_threadpool(self._ping_sync)
+        except Exception as e:
+            self.healthy = False
+            self.last_error = f"{type(e).__name__}: {e}"
+        else:
+            self.healthy = True
+            self.last_error = None
+
+    async def dispose(self) -> None:
+        if DB_ASYNC:
+            await self.engine.dispose()
+        else:
+            self.engine.dispose()
+
+
+class ReplicaSet:
+    """정상 상태인 복제본을 라운드 로빈으로 선택 (모두 비정상이면 None)"""
+
+    def __init__(self, replicas: list[_Replica]):
+        self.replicas = replicas
+        self._next_index = 0
+
+    def pick(self) -> _Replica | None:
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next_index % len(self.replicas)]
+            self._next_index += 1
+            if replica.healthy:
+                return replica
+        return None
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    def describe(self) -> list[dict]:
+        return [
+            {"name": replica.name, "healthy": replica.healthy, "last_error": replica.last_error}
+            for replica in self.replicas
+        ]
+
+
+replica_set = ReplicaSet([_Replica(database_url) for database_url in DATABASE_REPLICA_URLS])
+_health_check_task: asyncio.Task | None = None
+_sequence_sweep_task: asyncio.Task | None = None
+
+# student_pk → 마지막 쓰기 시각 (프로세스 로컬)
+_recent_writes: dict[int, float] = {}
+
+
+def _get_request_student_pk(request: Request) -> int | None:
+    """get_current_user가 이미 검증해 캐시한 토큰에서만 student_pk를 꺼냄"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token_cache.peek(token)
+
+
+def _record_write(request: Request) -> None:
+    student_pk = _get_request_student_pk(request)
+    if student_pk is None:
+        return
+
+    now = time.monotonic()
+    _recent_writes[student_pk] = now
+    # 기록이 쌓이지 않도록 만료된 항목을 정리
+    if len(_recent_writes) > 1024:
+        expired_pks = [pk for pk, written_at in _recent_writes.items() if now - written_at > READ_YOUR_WRITES_SECONDS]
+        for expired_pk in expired_pks:
+            del _recent_writes[expired_pk]
+
+
+def _wrote_recently(request: Request) -> bool:
+    student_pk = _get_request_student_pk(request)
+    written_at = _recent_writes.get(student_pk) if student_pk is not None else None
+    return written_at is not None and time.monotonic() - written_at < READ_YOUR_WRITES_SECONDS
+
+
+@asynccontextmanager
+async def _open_session(session_factory):
+    if DB_ASYNC:
+        async with session_factory() as db:
+            yield db
+        return
+
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        # 스레드풀이 커넥션 대기 중인 요청으로 가득 차도 반환이 막히지 않도록 루프에서 바로 닫음
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def open_primary_session():
+    """의존성 밖(스트리밍 응답의 인증 등)에서 잠깐 쓰고 바로 닫는 주 DB 세션 (async with로 사용)"""
+    return _open_session(AsyncSessionLocal if DB_ASYNC else SessionLocal)
+
+
+async def get_session(request: Request):
+    """DB_ASYNC 설정에 따라 주 DB의 AsyncSession 또는 동기 Session을 제공하는 의존성"""
+    async with open_primary_session() as db:
+        yield db
+
+    # 예외 없이 끝난 쓰기 요청은 read-your-writes 판단을 위해 기록
+    if request.method not in READ_METHODS:
+        _record_write(request)
+
+
+async def get_read_db(request: Request):
+    """읽기 전용 라우트용 세션: 복제본 라운드 로빈, 최근 쓰기 사용자와 복제본 장애 시에는 주 DB"""
+    replica = None if _wrote_recently(request) else replica_set.pick()
+    if replica is None:
+        session_factory = AsyncSessionLocal if DB_ASYNC else SessionLocal
+    else:
+        session_factory = replica.session_factory
+
+    async with _open_session(session_factory) as db:
+        yield db
+
+
+async def run_service(db: Session | AsyncSession, func, /, *args, **kwargs):
+    """services/의 동기 함수 func(db, ...)를 이벤트 루프를 막지 않고 실행
+
+    AsyncSession이면 run_sync로 비동기 드라이버 위에서, 동기 Session이면 스레드풀에서 실행한다.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(func, *args, **kwargs)
+    return await run_in_threadpool(func, db, *args, **kwargs)
+
+
+def _load_with_versions(db: Session, version_keys: tuple[str, ...], func, kwargs: dict):
+    # 순번 없는 기록 → 버전 → 데이터 순으로 읽어야 데이터가 버전보다 오래된 상태로 ETag가 붙지 않음
+    pending = has_unsequenced_changes(db)
+    versions = load_versions(db, version_keys)
+    return versions, pending, func(db, **kwargs)
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: Session | AsyncSession,
+    version_keys: tuple[str, ...],
+    func,
+    /,
+    **kwargs,
+):
+    """테이블 버전 ETag가 If-None-Match와 같으면 304, 아니면 func 결과에 ETag를 붙여 반환
+
+    캐시된 버전이 충분히 최근이면 DB 세션을 쓰지 않고 바로 304를 반환한다. 순번을 매기지 않은 변경 기록이
+    남아 있으면 버전이 아직 오르지 않은 쓰기가 있는 것이므로 ETag 없이 결과를 반환한다.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    query_string = request.url.query
+
+    versions = cached_versions(version_keys) if if_none_match else None
+    if versions is not None:
+        etag = make_etag(versions, query_string)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    versions, pending, result = await run_service(db, _load_with_versions, version_keys, func, kwargs)
+    if pending:
+        response.headers["Cache-Control"] = "no-store"
+        return result
+
+    remember_versions(versions)
+    etag = make_etag(versions, query_string)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return result
+
+
+async def _run_replica_health_checks() -> None:
+    while True:
+        await replica_set.check_all()
+        await asyncio.sleep(REPLICA_HEALTH_CHECK_SECONDS)
+
+
+def start_replica_health_checks() -> None:
+    global _health_check_task
+    if replica_set.replicas and _health_check_task is None:
+        _health_check_task = asyncio.create_task(_run_replica_health_checks())
+
+
+async def stop_replica_health_checks() -> None:
+    global _health_check_task
+    if _health_check_task is not None:
+        _health_check_task.cancel()
+        _health_check_task = None
+
+    for replica in replica_set.replicas:
+        await replica.dispose()
+
+
+def _sequence_pending_changes_sync() -> dict[str, int]:
+    # 확인과 순번 매기기를 다른 트랜잭션으로 나눠, 순번 행을 잠근 뒤의 조회가 잠금 전 스냅샷을 쓰지 않게 함
+    with engine.connect() as connection:
+        if not has_unsequenced_changes(connection):
+            return {}
+    with engine.begin() as connection:
+        return sequence_changes(connection)
+
+
+async def _sequence_pending_changes() -> dict[str, int]:
+    if not DB_ASYNC:
+        return await run_in_threadpool(_sequence_pending_changes_sync)
+
+    async with async_engine.connect() as connection:
+        if not await connection.run_sync(has_unsequenced_changes):
+            return {}
+    async with async_engine.begin() as connection:
+        return await connection.run_sync(sequence_changes)
+
+
+async def _run_change_log_sequence_sweeps() -> None:
+    while True:
+        await asyncio.sleep(CHANGE_LOG_SEQUENCE_SWEEP_SECONDS)
+        try:
+            versions = await _sequence_pending_changes()
+        except Exception as e:
+            print(f"[CHANGE LOG] sequence sweep failed: {type(e).__name__}: {e}")
+            continue
+        if versions:
+            remember_versions(versions)
+
+
+def start_change_log_sequence_sweeps() -> None:
+    global _sequence_sweep_task
+    if _sequence_sweep_task is None:
+        _sequence_sweep_task = asyncio.create_task(_run_change_log_sequence_sweeps())
+
+
+async def stop_change_log_sequence_sweeps() -> None:
+    global _sequence_sweep_task
+    if _sequence_sweep_task is not None:
+        _sequence_sweep_task.cancel()
+        _sequence_sweep_task = None
+
+
+async def dispose_async_engine() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -0,0 +1,286 @@
+"""테이블별 쓰기 버전, 변경 기록(change_log)과 ETag 계산
+
+세션 이벤트로 트랜잭션이 건드린 엔티티를 모아 두었다가 커밋 직전에 change_log에 순번 없이(version=0)
+추가한다. 공유 행을 잠그지 않으므로 쓰기 트랜잭션끼리는 서로 기다리지 않는다.
+
+커밋 뒤에는 짧은 별도 트랜잭션에서 change_log 순번 행을 잠그고, 커밋된 순번 없는 기록에 커밋 순서대로
+순번을 매긴 뒤 table_versions의 엔티티 버전을 그 순번으로 올린다. 순번 매기기가 직렬화되므로 순번은
+보이게 된 순서와 같아 커서 이후의 변경을 빠뜨리지 않는다. 순번 매기기가 실패하면 잠시 뒤 다시 시도하고,
+그래도 실패했거나 그 전에 프로세스가 죽어 남은 기록은 다음 쓰기나 lifespan의 주기 작업
+(CHANGE_LOG_SEQUENCE_SWEEP_SECONDS)이 처리한다. 순번 없는 기록이 남아 있는 동안 조회 라우트는 304를 주지 않는다.
+
+조회 라우트는 버전으로 강한 ETag를 만들고, 프로세스에 캐시한 버전이
+TABLE_VERSION_CACHE_SECONDS 안의 값이면 DB를 조회하지 않고 If-None-Match에 304로 응답한다.
+버전은 커밋 직후에 오르므로 그 사이(수 ms)의 조회는 이전 ETag를 받을 수 있다.
+"""
+import hashlib
+import os
+import threading
+import time
+
+from sqlalchemy import bindparam, event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, SessionTransaction
+
+from db.models import ChangeLog, TableVersion
+
+TABLE_VERSION_CACHE_SECONDS = float(os.getenv("TABLE_VERSION_CACHE_SECONDS", "1"))
+# 한 문장이 이보다 많은 행을 바꾸면 행별 기록 대신 테이블 전체 reset으로 기록
+CHANGE_LOG_RESET_THRESHOLD = int(os.getenv("CHANGE_LOG_RESET_THRESHOLD", "1000"))
+# 커밋 뒤 한 번에 순번을 매기는 최대 기록 수 (남으면 다음 순번 매기기에서 처리)
+CHANGE_LOG_SEQUENCE_BATCH_SIZE = int(os.getenv("CHANGE_LOG_SEQUENCE_BATCH_SIZE", "10000"))
+# 커밋 뒤 순번 매기기가 실패했을 때 다시 시도하는 횟수와 첫 대기 시간 (시도마다 두 배)
+CHANGE_LOG_SEQUENCE_RETRIES = int(os.getenv("CHANGE_LOG_SEQUENCE_RETRIES", "3"))
+CHANGE_LOG_SEQUENCE_RETRY_SECONDS = float(os.getenv("CHANGE_LOG_SEQUENCE_RETRY_SECONDS", "0.05"))
+
+# 실제 테이블 → (버전/엔티티 키, 엔티티 ID 컬럼) (구역 대상 학년은 구역 응답의 일부)
+VERSIONED_TABLES = {
+    "students": ("students", "student_pk"),
+    "areas": ("areas", "area_id"),
+    "area_target_grades": ("areas", "area_id"),
+    "schedules": ("schedules", "schedule_id"),
+    "assignments": ("assignments", "assignment_id"),
+    "trades": ("trades", "request_id"),
+}
+VERSION_KEYS = tuple(sorted({version_key for version_key, _ in VERSIONED_TABLES.values()}))
+# change_log 순번 매기기를 직렬화하는 잠금 겸 마지막 순번 행
+CHANGE_LOG_KEY = "change_log"
+
+_CHANGES_KEY = "table_versions.changes"
+_SEQUENCE_KEY = "table_versions.sequence"
+_COMMITTED_KEY = "table_versions.committed"
+
+_lock = threading.Lock()
+# 버전 키 → (버전, 확인 시각)
+_cached_versions: dict[str, tuple[int, float]] = {}
+
+
+def _record(session: Session, table_name: str, entity_id: int | None, op: str) -> None:
+    versioned = VERSIONED_TABLES.get(table_name)
+    if versioned is None:
+        return
+
+    version_key, _ = versioned
+    changes = session.info.setdefault(_CHANGES_KEY, {})
+    if entity_id is None:
+        changes[(version_key, None)] = "reset"
+        return
+
+    if table_name == version_key:
+        changes[(version_key, entity_id)] = op
+    else:
+        # 구역 대상 학년 행의 추가/삭제는 구역 수정 (같은 트랜잭션에서 구역이 삭제됐으면 삭제 유지)
+        changes.setdefault((version_key, entity_id), "upsert")
+
+
+def _record_instance(session: Session, instance, op: str) -> None:
+    table_name = instance.__table__.name
+    versioned = VERSIONED_TABLES.get(table_name)
+    if versioned is not None:
+        _record(session, table_name, getattr(instance, versioned[1]), op)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, _) -> None:
+    for instance in session.new:
+        _record_instance(session, instance, "upsert")
+    for instance in session.dirty:
+        if session.is_modified(instance, include_collections=False):
+            _record_instance(session, instance, "upsert")
+    for instance in session.deleted:
+        _record_instance(session, instance, "delete")
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_changes(orm_execute_state) -> None:
+    # flush를 거치지 않는 INSERT/UPDATE/DELETE 문 (다중 행 INSERT, query.update/delete 등)
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    # 호출한 쪽이 record_entity_changes로 대상 ID를 직접 기록하는 문
+    if orm_execute_state.execution_options.get("record_changes") is False:
+        return
+
+    session = orm_execute_state.session
+    statement = orm_execute_state.statement
+    table = statement.table
+    versioned = VERSIONED_TABLES.get(table.name)
+    if versioned is None:
+        return
+
+    # 다중 행 INSERT는 생성된 ID를 알 수 없으므로 테이블 전체 reset (ID를 다시 읽는 서비스는 직접 기록)
+    if orm_execute_state.is_insert or statement.whereclause is None:
+        _record(session, table.name, None, "reset")
+        return
+
+    # 조건부 UPDATE/DELETE는 실행 전에 대상 ID를 같은 트랜잭션에서 미리 읽음
+    id_column = table.c[versioned[1]]
+    entity_ids = (
+        session.connection()
+        .execute(select(id_column).where(statement.whereclause).distinct().limit(CHANGE_LOG_RESET_THRESHOLD + 1))
+        .scalars()
+        .all()
+    )
+    if len(entity_ids) > CHANGE_LOG_RESET_THRESHOLD:
+        _record(session, table.name, None, "reset")
+        return
+
+    op = "delete" if orm_execute_state.is_delete else "upsert"
+    for entity_id in entity_ids:
+        _record(session, table.name, entity_id, op)
+
+
+def record_entity_changes(session: Session, table_name: str, entity_ids, op: str = "upsert") -> None:
+    """execution_options(record_changes=False)로 실행한 다중 행 쓰기의 대상 ID를 기록
+
+    CHANGE_LOG_RESET_THRESHOLD보다 많으면 행별 기록 대신 테이블 전체 reset으로 기록한다.
+    """
+    entity_ids = list(entity_ids)
+    if len(entity_ids) > CHANGE_LOG_RESET_THRESHOLD:
+        _record(session, table_name, None, "reset")
+        return
+    for entity_id in entity_ids:
+        _record(session, table_name, entity_id, op)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending_changes(session: Session) -> None:
+    session.flush()
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+
+    # 순번(version)은 커밋 뒤에 매기므로 여기서는 잠금 없이 추가만 함
+    session.connection().execute(
+        insert(ChangeLog),
+        [
+            {"entity": version_key, "entity_id": entity_id, "op": op, "version": 0}
+            for (version_key, entity_id), op in changes.items()
+        ],
+    )
+    session.info[_SEQUENCE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    if session.info.pop(_SEQUENCE_KEY, None):
+        session.info[_COMMITTED_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _sequence_committed_changes(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is not None:
+        return
+
+    # 롤백된 트랜잭션이 모은 변경은 버리고, 다음 트랜잭션에서 새로 모음
+    session.info.pop(_CHANGES_KEY, None)
+    session.info.pop(_SEQUENCE_KEY, None)
+    if not session.info.pop(_COMMITTED_KEY, None):
+        return
+
+    # 커넥션을 반납한 뒤에 실행되므로 한 요청이 커넥션 두 개를 동시에 잡지 않음
+    bind = session.get_bind()
+    for attempt in range(CHANGE_LOG_SEQUENCE_RETRIES + 1):
+        try:
+            with bind.begin() as connection:
+                versions = sequence_changes(connection)
+        except Exception as e:
+            # 커밋은 이미 끝났으므로 요청은 실패시키지 않고, 끝내 실패한 기록은 주기 작업이 처리
+            print(f"[CHANGE LOG] sequencing failed (attempt {attempt + 1}): {type(e).__name__}: {e}")
+            if attempt < CHANGE_LOG_SEQUENCE_RETRIES:
+                time.sleep(CHANGE_LOG_SEQUENCE_RETRY_SECONDS * 2**attempt)
+            continue
+        if versions:
+            remember_versions(versions)
+        return
+
+
+def has_unsequenced_changes(connection: Connection | Session) -> bool:
+    """커밋됐지만 아직 순번을 매기지 않은 change_log 기록이 있는지 (버전이 아직 오르지 않은 쓰기)"""
+    return connection.execute(select(ChangeLog.change_id).where(ChangeLog.version == 0).limit(1)).first() is not None
+
+
+def sequence_changes(connection: Connection) -> dict[str, int]:
+    """커밋된 순번 없는 change_log 기록에 순번을 매기고 엔티티 버전을 올림 (바뀐 버전 반환)"""
+    # 순번 행을 먼저 잠가(쓰기) 순번 매기기를 직렬화하고, 그 뒤의 조회는 잠금 시점까지 커밋된 기록을 봄
+    connection.execute(
+        update(TableVersion).where(TableVersion.table_name == CHANGE_LOG_KEY).values(version=TableVersion.version)
+    )
+    counter = connection.execute(
+        select(TableVersion.version).where(TableVersion.table_name == CHANGE_LOG_KEY)
+    ).scalar()
+    if counter is None:
+        counter = 0
+        connection.execute(insert(TableVersion).values(table_name=CHANGE_LOG_KEY, version=0))
+
+    pending = connection.execute(
+        select(ChangeLog.change_id, ChangeLog.entity)
+        .where(ChangeLog.version == 0)
+        .order_by(ChangeLog.change_id)
+        .limit(CHANGE_LOG_SEQUENCE_BATCH_SIZE)
+    ).all()
+    if not pending:
+        return {}
+
+    versions: dict[str, int] = {}
+    assigned = []
+    for sequence, (change_id, entity) in enumerate(pending, start=counter + 1):
+        assigned.append({"b_change_id": change_id, "b_version": sequence})
+        versions[entity] = sequence
+    change_log = ChangeLog.__table__
+    connection.execute(
+        update(change_log)
+        .where(change_log.c.change_id == bindparam("b_change_id"), change_log.c.version == 0)
+        .values(version=bindparam("b_version")),
+        assigned,
+    )
+
+    versions[CHANGE_LOG_KEY] = counter + len(pending)
+    for version_key, version in sorted(versions.items()):
+        result = connection.execute(
+            update(TableVersion).where(TableVersion.table_name == version_key).values(version=version)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(TableVersion).values(table_name=version_key, version=version))
+    return versions
+
+
+def remember_versions(versions: dict[str, int]) -> None:
+    """확인한 버전을 캐시 (복제본이 뒤처진 값을 주더라도 버전이 줄어들지 않게 큰 값 유지)"""
+    now = time.monotonic()
+    with _lock:
+        for version_key, version in versions.items():
+            cached = _cached_versions.get(version_key)
+            _cached_versions[version_key] = (max(version, cached[0]) if cached else version, now)
+
+
+def cached_versions(version_keys: tuple[str, ...]) -> dict[str, int] | None:
+    """TABLE_VERSION_CACHE_SECONDS 안에 확인한 버전 (하나라도 오래됐으면 None)"""
+    expires_before = time.monotonic() - TABLE_VERSION_CACHE_SECONDS
+    with _lock:
+        entries = [_cached_versions.get(version_key) for version_key in version_keys]
+    if any(entry is None or entry[1] < expires_before for entry in entries):
+        return None
+    return {version_key: entry[0] for version_key, entry in zip(version_keys, entries)}
+
+
+def load_versions(db: Session, version_keys: tuple[str, ...]) -> dict[str, int]:
+    versions = dict.fromkeys(version_keys, 0)
+    versions.update(
+        db.query(TableVersion.table_name, TableVersion.version).filter(TableVersion.table_name.in_(version_keys)).all()
+    )
+    return versions
+
+
+def make_etag(versions: dict[str, int], query_string: str = "") -> str:
+    tag = "-".join(f"{version_key}.{version}" for version_key, version in sorted(versions.items()))
+    if query_string:
+        tag += "-" + hashlib.sha1(query_string.encode("utf-8")).hexdigest()[:12]
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,195 @@
+"""학생별 실시간 이벤트 발행/구독 (GET /events/stream SSE용)
+
+서비스는 publish_after_commit으로 이벤트를 세션에 모아 두고, 트랜잭션이 커밋되면 브로커로 보낸다
+(롤백되면 버린다). 기본 InProcessBroker는 이 프로세스에 연결된 구독자에게만 전달한다.
+워커가 여러 개면 EVENT_BROKER_URL=tcp://host:port 로 events.relay(로컬 브로커 대역)에 연결해
+모든 워커의 구독자에게 전달하고, 릴레이와 연결이 끊긴 동안에는 자기 프로세스 구독자에게만 전달한다.
+
+이벤트는 "다시 조회하라"는 알림이므로 유실될 수 있다. 클라이언트는 재연결 시 전체를 다시 읽는다.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import threading
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+EVENT_BROKER_URL = os.getenv("EVENT_BROKER_URL", "")
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_BROKER_RECONNECT_SECONDS = int(os.getenv("EVENT_BROKER_RECONNECT_SECONDS", "3"))
+
+_PENDING_KEY = "events.pending"
+
+
+class Subscription:
+    """스트림 하나의 이벤트 큐 (구독한 이벤트 루프에서만 읽고 씀)"""
+
+    def __init__(self, student_pk: int):
+        self.student_pk = student_pk
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+    def offer(self, message: dict) -> None:
+        # 읽지 못하는 클라이언트가 메모리를 계속 잡지 않도록 가득 차면 가장 오래된 이벤트를 버림
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class InProcessBroker:
+    """student_pk별 구독자에게 이벤트를 나눠 주는 프로세스 로컬 pub/sub"""
+
+    def __init__(self):
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, student_pk: int) -> Subscription:
+        subscription = Subscription(student_pk)
+        with self._lock:
+            self._subscriptions.setdefault(student_pk, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.student_pk)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.student_pk]
+
+    def deliver(self, student_pks: Iterable[int], message: dict) -> None:
+        """이 프로세스의 구독자 큐에 넣음 (서비스 스레드풀 등 어느 스레드에서 불러도 됨)"""
+        with self._lock:
+            subscriptions = [
+                subscription
+                for student_pk in student_pks
+                for subscription in self._subscriptions.get(student_pk, ())
+            ]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # 구독한 이벤트 루프가 이미 닫힘
+                self.unsubscribe(subscription)
+
+    def publish(self, student_pks: list[int], message: dict) -> None:
+        self.deliver(student_pks, message)
+
+    def describe(self) -> dict:
+        with self._lock:
+            return {
+                "broker": "in_process",
+                "students": len(self._subscriptions),
+                "subscriptions": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            }
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RelayBroker(InProcessBroker):
+    """events.relay로 모든 워커와 이벤트를 주고받는 브로커
+
+    발행한 이벤트는 릴레이를 거쳐 보낸 워커에게도 돌아오므로, 연결된 동안에는 받은 이벤트만 로컬로 전달한다.
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        parts = urlsplit(url)
+        if parts.scheme != "tcp" or not parts.hostname or not parts.port:
+            raise ValueError(f"EVENT_BROKER_URL은 tcp://host:port 형식이어야 합니다: {url}")
+        self.host = parts.hostname
+        self.port = parts.port
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+
+    def publish(self, student_pks: list[int], message: dict) -> None:
+        line = json.dumps({"student_pks": student_pks, "message": message}, ensure_ascii=False) + "\n"
+        if self._loop is None or self._writer is None:
+            self.deliver(student_pks, message)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._send, line.encode("utf-8"), student_pks, message)
+        except RuntimeError:
+            self.deliver(student_pks, message)
+
+    def _send(self, line: bytes, student_pks: list[int], message: dict) -> None:
+        # 발행 후 루프에서 실행되기 전에 연결이 끊겼을 수 있으므로 다시 확인
+        if self._writer is None or self._writer.is_closing():
+            self.deliver(student_pks, message)
+            return
+        self._writer.write(line)
+
+    def describe(self) -> dict:
+        return {
+            **super().describe(),
+            "broker": "relay",
+            "relay": f"{self.host}:{self.port}",
+            "connected": self._writer is not None,
+        }
+
+    async def _receive(self) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                print(f"[EVENTS] relay connect failed: {type(e).__name__}: {e}")
+                await asyncio.sleep(EVENT_BROKER_RECONNECT_SECONDS)
+                continue
+
+            self._writer = writer
+            try:
+                while line := await reader.readline():
+                    envelope = json.loads(line)
+                    self.deliver(envelope["student_pks"], envelope["message"])
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[EVENTS] relay connection lost: {type(e).__name__}: {e}")
+            finally:
+                self._writer = None
+                writer.close()
+            await asyncio.sleep(EVENT_BROKER_RECONNECT_SECONDS)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._receive())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._loop = None
+
+
+broker: InProcessBroker = RelayBroker(EVENT_BROKER_URL) if EVENT_BROKER_URL else InProcessBroker()
+
+
+def publish_after_commit(db: Session, student_pks: Iterable[int | None], event_type: str, **payload) -> None:
+    """현재 트랜잭션이 커밋되면 student_pks 학생의 스트림으로 {"type": event_type, **payload}를 보냄"""
+    recipients = sorted({student_pk for student_pk in student_pks if student_pk is not None})
+    if recipients:
+        db.info.setdefault(_PENDING_KEY, []).append((recipients, {"type": event_type, **payload}))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session) -> None:
+    for student_pks, message in session.info.pop(_PENDING_KEY, ()):
+        broker.publish(student_pks, message)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_events(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,60 @@
+"""워커 프로세스 간 이벤트 릴레이 (Redis pub/sub 같은 외부 브로커의 로컬 대역)
+
+각 워커가 EVENT_BROKER_URL로 TCP 연결해 한 줄짜리 JSON 이벤트를 보내면, 보낸 워커를 포함해 연결된
+모든 워커로 그대로 전달한다. 저장·재전송은 하지 않으므로 연결이 끊긴 동안의 이벤트는 잃고,
+전송 버퍼가 EVENT_RELAY_MAX_BUFFER_BYTES를 넘게 밀린 워커는 연결을 끊어 재연결하게 한다.
+
+사용법: python -m events.relay [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import os
+
+EVENT_RELAY_MAX_BUFFER_BYTES = int(os.getenv("EVENT_RELAY_MAX_BUFFER_BYTES", str(1024 * 1024)))
+
+_workers: set[asyncio.StreamWriter] = set()
+
+
+def _broadcast(line: bytes) -> None:
+    for worker in list(_workers):
+        if worker.is_closing():
+            continue
+        if worker.transport.get_write_buffer_size() > EVENT_RELAY_MAX_BUFFER_BYTES:
+            worker.close()
+            continue
+        worker.write(line)
+
+
+async def _handle_worker(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    peer = writer.get_extra_info("peername")
+    _workers.add(writer)
+    print(f"[RELAY] worker connected: {peer} (total {len(_workers)})")
+    try:
+        while line := await reader.readline():
+            _broadcast(line)
+    except (OSError, ValueError) as e:
+        print(f"[RELAY] worker error: {peer}: {type(e).__name__}: {e}")
+    finally:
+        _workers.discard(writer)
+        writer.close()
+        print(f"[RELAY] worker disconnected: {peer} (total {len(_workers)})")
+
+
+async def serve(host: str, port: int) -> None:
+    server = await asyncio.start_server(_handle_worker, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"[RELAY] listening on {args.host}:{args.port}")
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,34 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
+from auth.hashing import shutdown_password_pool, start_password_pool
 from db.models import init_db
-from router import assignments, areas, auth, schedules, students, trades
+from db.session import (
+    dispose_async_engine,
+    start_change_log_sequence_sweeps,
+    start_replica_health_checks,
+    stop_change_log_sequence_sweeps,
+    stop_replica_health_checks,
+)
+from events.broker import broker
+from router import assignments, areas, auth, changes, events, me, metrics, schedules, students, trades
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     init_db()
+    start_password_pool()
+    start_replica_health_checks()
+    start_change_log_sequence_sweeps()
+    await broker.start()
     yield
+    await broker.stop()
+    await stop_change_log_sequence_sweeps()
+    await stop_replica_health_checks()
+    shutdown_password_pool()
+    await dispose_async_engine()
 
 
 app = FastAPI(
@@ -19,6 +37,8 @@ app = FastAPI(
     description="청소 구역 배정 및 관리를 위한 API 서버",
     version="1.0.0",
     lifespan=lifespan,
+    # 응답 직렬화는 orjson으로 (response_model 검증 후 dict를 바로 bytes로 변환)
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -35,6 +55,10 @@ app.include_router(areas.router)
 app.include_router(schedules.router)
 app.include_router(assignments.router)
 app.include_router(trades.router)
+app.include_router(me.router)
+app.include_router(changes.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
 
 # 정적 파일 마운트
 app.mount("/static/shared", StaticFiles(directory="static/shared"), name="shared")
@@ -0,0 +1,16 @@
+"""학생별 배정 집계 원장(student_assignment_stats) 재계산 스크립트
+
+사용법: python rebuild_assignment_stats.py
+"""
+from db.models import SessionLocal, init_db
+from services.assignment_stats_service import rebuild_assignment_stats
+
+init_db()
+db = SessionLocal()
+
+try:
+    student_count = rebuild_assignment_stats(db)
+    db.commit()
+    print(f"배정 집계 원장을 재계산했습니다. (학생 {student_count}명)")
+finally:
+    db.close()
@@ -1,50 +1,53 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
 
 from auth.dependencies import get_current_user, require_admin
-from db.models import Student, get_db
-from db.schemas import AreaCreate, AreaUpdate
+from db.models import Student
+from db.schemas import Area, AreaCreate, AreaResponse, AreaUpdate, MessageResponse
+from db.session import DbSession, conditional_get, get_read_db, get_session, run_service
 from services import areas_service
 
 router = APIRouter(prefix="/areas", tags=["청소 구역 관리"])
 
 
-@router.get("/")
-def get_areas(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=list[Area])
+async def get_areas(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_read_db),
     _: Student = Depends(get_current_user),
 ):
-    return areas_service.get_areas(db=db)
+    return await conditional_get(request, response, db, ("areas",), areas_service.get_areas)
 
 
-@router.post("/")
-def add_areas(
+@router.post("/", response_model=AreaResponse)
+async def add_areas(
     payload: AreaCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return areas_service.add_area(
-        db=db,
+    return await run_service(
+        db,
+        areas_service.add_area,
         name=payload.name,
         need_peoples=payload.need_peoples,
         target_grades=payload.target_grades,
     )
 
 
-@router.patch("/{area_id}")
-def update_areas(
+@router.patch("/{area_id}", response_model=AreaResponse)
+async def update_areas(
     area_id: int,
     update_data: AreaUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return areas_service.update_area(db=db, area_id=area_id, update_data=update_data)
+    return await run_service(db, areas_service.update_area, area_id=area_id, update_data=update_data)
 
 
-@router.delete("/{area_id}")
-def del_areas(
+@router.delete("/{area_id}", response_model=MessageResponse)
+async def del_areas(
     area_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return areas_service.del_area(db=db, area_id=area_id)
+    return await run_service(db, areas_service.del_area, area_id=area_id)
@@ -1,73 +1,121 @@
+from typing import Literal
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
 
 from auth.dependencies import get_current_user, require_admin
-from db.models import Student, get_db
-from services import assignments_service
+from db.models import Student
+from db.schemas import (
+    Assignment,
+    AssignmentDeleteResponse,
+    AssignmentReassignResponse,
+    AssignmentRunResponse,
+    AssignmentStatusResponse,
+    BatchReassignResponse,
+    Page,
+)
+from db.session import DbSession, get_read_db, get_session, run_service
+from services import assignments_service, pagination
+from services.pagination import MAX_PAGE_LIMIT
 
 router = APIRouter(prefix="/assignments", tags=["청소 배정 관리"])
 
 
-@router.get("/")
-def get_assignments(
+@router.get("/", response_model=list[Assignment] | Page[Assignment])
+async def get_assignments(
     assignment_id: int | None = Query(default=None),
     schedule_id: int | None = Query(default=None),
     student_pk: int | None = Query(default=None),
     area_id: int | None = Query(default=None),
     status: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_LIMIT, description="지정하면 페이지 봉투로 반환"),
+    after: int | None = Query(default=None, description="이전 페이지의 next_after"),
+    fields: str | None = Query(default=None, description="응답에 포함할 컬럼 (쉼표 구분)"),
+    db: DbSession = Depends(get_read_db),
     _: Student = Depends(get_current_user),
 ):
-    return assignments_service.get_assignments(
-        db=db,
+    result = await run_service(
+        db,
+        assignments_service.get_assignments,
         assignment_id=assignment_id,
         schedule_id=schedule_id,
         student_pk=student_pk,
         area_id=area_id,
         status=status,
+        limit=limit,
+        after=after,
+        fields=fields,
     )
+    return pagination.projected_response(result) if fields else result
+
+
+@router.post("/", response_model=AssignmentRunResponse, response_model_exclude_unset=True)
+async def add_assignment(
+    engine: Literal["greedy", "optimal"] = Query(default="greedy", description="greedy=구역별 순차 배정, optimal=최소 비용 유량"),
+    dry_run: bool = Query(default=False, description="true면 저장하지 않고 배정안(plan_id)만 반환"),
+    seed: int | None = Query(default=None, description="난수 시드 (같은 데이터·시드면 같은 배정안, dry_run에서 생략하면 정해서 반환)"),
+    db: DbSession = Depends(get_session),
+    _: Student = Depends(require_admin),
+):
+    return await run_service(db, assignments_service.add_assignment, engine=engine, dry_run=dry_run, seed=seed)
 
 
-@router.post("/")
-def add_assignment(
-    db: Session = Depends(get_db),
+@router.post(
+    "/plans/{plan_id}/commit", response_model=AssignmentRunResponse, response_model_exclude_unset=True
+)
+async def commit_assignment_plan(
+    plan_id: str,
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return assignments_service.add_assignment(db=db)
+    return await run_service(db, assignments_service.commit_assignment_plan, plan_id=plan_id)
 
 
-@router.delete("/")
-def delete_assignments(
+@router.delete("/", response_model=AssignmentDeleteResponse, response_model_exclude_unset=True)
+async def delete_assignments(
     schedule_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return assignments_service.delete_assignments(db=db, schedule_id=schedule_id)
+    return await run_service(db, assignments_service.delete_assignments, schedule_id=schedule_id)
 
 
-@router.patch("/{assignment_id}/status")
-def update_assignment_status(
+@router.patch("/{assignment_id}/status", response_model=AssignmentStatusResponse)
+async def update_assignment_status(
     assignment_id: int,
     status: str = Query(...),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
+    _: Student = Depends(require_admin),
+):
+    return await run_service(
+        db,
+        assignments_service.update_assignment_status,
+        assignment_id=assignment_id,
+        status=status,
+    )
+
+
+@router.post("/reassign", response_model=BatchReassignResponse, response_model_exclude_unset=True)
+async def reassign_canceled_assignments(
+    schedule_id: int | None = Query(default=None, description="생략하면 모든 예정 일정의 취소된 배정을 재배정"),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return assignments_service.update_assignment_status(db=db, assignment_id=assignment_id, status=status)
+    return await run_service(db, assignments_service.reassign_canceled_assignments, schedule_id=schedule_id)
 
 
-@router.post("/{assignment_id}/reassign")
-def reassign_canceled_assignment(
+@router.post("/{assignment_id}/reassign", response_model=AssignmentReassignResponse)
+async def reassign_canceled_assignment(
     assignment_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return assignments_service.reassign_canceled_assignment(db=db, assignment_id=assignment_id)
+    return await run_service(db, assignments_service.reassign_canceled_assignment, assignment_id=assignment_id)
 
 
-@router.delete("/{assignment_id}")
-def delete_assignment(
+@router.delete("/{assignment_id}", response_model=AssignmentDeleteResponse, response_model_exclude_unset=True)
+async def delete_assignment(
     assignment_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return assignments_service.delete_assignment(db=db, assignment_id=assignment_id)
+    return await run_service(db, assignments_service.delete_assignment, assignment_id=assignment_id)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+
+from auth.dependencies import require_admin
+from db.models import Student
+from db.schemas import ChangeFeedResponse
+from db.session import DbSession, get_read_db, run_service
+from services import changes_service
+
+router = APIRouter(prefix="/changes", tags=["변경 피드"])
+
+
+@router.get("", response_model=ChangeFeedResponse)
+async def get_changes(
+    since: int | None = Query(default=None, ge=0, description="이전 응답의 cursor (없으면 현재 위치만 반환)"),
+    db: DbSession = Depends(get_read_db),
+    _: Student = Depends(require_admin),
+):
+    """since 이후 바뀐 학생·구역·일정·배정·교환을 엔티티별로 압축해 반환"""
+    return await run_service(db, changes_service.get_changes, since=since)
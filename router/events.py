@@ -0,0 +1,61 @@
+import asyncio
+import json
+import os
+import time
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from auth.dependencies import get_stream_user
+from auth.security import decode_access_token
+from db.models import Student
+from events.broker import broker
+
+# 프록시가 유휴 연결을 끊지 않도록 보내는 주석 줄 간격, 끊겼을 때 브라우저의 재연결 대기 시간
+EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+EVENT_STREAM_RETRY_MS = int(os.getenv("EVENT_STREAM_RETRY_MS", "3000"))
+
+router = APIRouter(prefix="/events", tags=["실시간 알림"])
+
+
+async def _event_stream(student_pk: int, expires_at: float):
+    # 응답이 시작된 뒤에 구독해야 클라이언트가 먼저 끊겨도 finally에서 구독이 해제됨
+    subscription = broker.subscribe(student_pk)
+    try:
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n\n"
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                yield "event: expired\ndata: {}\n\n"
+                return
+
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    timeout=min(EVENT_STREAM_HEARTBEAT_SECONDS, remaining),
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            yield f"event: {message['type']}\ndata: {json.dumps(message, ensure_ascii=False)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_events(
+    token: str = Query(description="액세스 토큰 (EventSource는 Authorization 헤더를 보낼 수 없음)"),
+    current_user: Student = Depends(get_stream_user),
+):
+    """내 교환 요청·배정이 바뀌면 알려 주는 Server-Sent Events 스트림
+
+    이벤트는 trade.created, trade.updated, trades.canceled, assignment.updated, assignment.reassigned이며
+    토큰이 만료되면 expired 이벤트를 보내고 스트림을 닫는다.
+    """
+    expires_at = decode_access_token(token)["exp"]
+    return StreamingResponse(
+        _event_stream(current_user.student_pk, expires_at),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
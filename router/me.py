@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+
+from auth.dependencies import get_current_user
+from db.models import Student
+from db.schemas import DashboardResponse
+from db.session import DbSession, get_read_db, run_service
+from services import dashboard_service
+
+router = APIRouter(prefix="/me", tags=["내 정보"])
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    db: DbSession = Depends(get_read_db),
+    current_user: Student = Depends(get_current_user),
+):
+    """유저 페이지 첫 화면에 필요한 내 배정·교환과 그들이 참조하는 일정·구역·학생 이름"""
+    return await run_service(db, dashboard_service.get_dashboard, student_pk=current_user.student_pk)
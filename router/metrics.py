@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+
+from auth.cache import principal_cache, token_cache
+from auth.dependencies import require_admin
+from db.models import Student, engine
+from db.pool_metrics import describe_pool, pool_stats
+from db.session import async_engine, replica_set
+from events.broker import broker
+
+router = APIRouter(prefix="/metrics", tags=["운영 지표"])
+
+
+@router.get("/auth-cache", response_model=dict)
+async def get_auth_cache_metrics(_: Student = Depends(require_admin)):
+    """인증 캐시(검증된 토큰, 인증 주체)의 적중/미스 횟수"""
+    return {
+        "token": token_cache.stats(),
+        "principal": principal_cache.stats(),
+    }
+
+
+@router.get("/db-pool", response_model=dict)
+async def get_db_pool_metrics(_: Student = Depends(require_admin)):
+    """커넥션 풀 사용량과 체크아웃 대기 시간 히스토그램"""
+    return {
+        "pool": describe_pool(engine.pool),
+        "async_pool": describe_pool(async_engine.pool) if async_engine is not None else None,
+        "checkout": pool_stats.snapshot(),
+        "replicas": replica_set.describe(),
+    }
+
+
+@router.get("/event-streams", response_model=dict)
+async def get_event_stream_metrics(_: Student = Depends(require_admin)):
+    """열려 있는 실시간 알림 스트림 수와 브로커(프로세스 로컬/릴레이) 연결 상태"""
+    return broker.describe()
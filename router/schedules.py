@@ -1,70 +1,93 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from auth.dependencies import get_current_user, require_admin
-from db.models import Student, get_db
-from db.schemas import ScheduleUpdate
-from services import schedules_service
+from db.models import Student
+from db.schemas import (
+    Page,
+    Schedule,
+    ScheduleCreateResponse,
+    ScheduleDeleteAllResponse,
+    ScheduleDeleteResponse,
+    ScheduleUpdate,
+    ScheduleUpdateResponse,
+)
+from db.session import DbSession, conditional_get, get_read_db, get_session, run_service
+from services import pagination, schedules_service
+from services.pagination import MAX_PAGE_LIMIT
 
 router = APIRouter(prefix="/schedules", tags=["일정 관리"])
 
 
-@router.get("/")
-def get_schedules(
+@router.get("/", response_model=list[Schedule] | Page[Schedule])
+async def get_schedules(
+    request: Request,
+    response: Response,
     schedule_id: int | None = None,
     cleaning_date: date | None = None,
     status: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_LIMIT, description="지정하면 페이지 봉투로 반환"),
+    after: int | None = Query(default=None, description="이전 페이지의 next_after"),
+    fields: str | None = Query(default=None, description="응답에 포함할 컬럼 (쉼표 구분)"),
+    db: DbSession = Depends(get_read_db),
     _: Student = Depends(get_current_user),
 ):
-    return schedules_service.get_schedules(
-        db=db,
+    result = await conditional_get(
+        request,
+        response,
+        db,
+        ("schedules",),
+        schedules_service.get_schedules,
         schedule_id=schedule_id,
         cleaning_date=cleaning_date,
         status=status,
+        limit=limit,
+        after=after,
+        fields=fields,
     )
+    return pagination.projected_response(result, response.headers) if fields else result
 
 
-@router.post("/")
-def add_schedule(
+@router.post("/", response_model=ScheduleCreateResponse)
+async def add_schedule(
     start_date: date,
     end_date: date,
     weekdays: list[int] = Query(..., description="0=월요일, 1=화요일, 2=수요일, 3=목요일, 4=금요일"),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return schedules_service.add_schedule(
-        db=db,
+    return await run_service(
+        db,
+        schedules_service.add_schedule,
         start_date=start_date,
         end_date=end_date,
         weekdays=weekdays,
     )
 
 
-@router.patch("/{schedule_id}")
-def update_schedule(
+@router.patch("/{schedule_id}", response_model=ScheduleUpdateResponse)
+async def update_schedule(
     schedule_id: int,
     update_data: ScheduleUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return schedules_service.update_schedule(db=db, schedule_id=schedule_id, update_data=update_data)
+    return await run_service(db, schedules_service.update_schedule, schedule_id=schedule_id, update_data=update_data)
 
 
-@router.delete("/")
-def delete_all_schedules(
-    db: Session = Depends(get_db),
+@router.delete("/", response_model=ScheduleDeleteAllResponse)
+async def delete_all_schedules(
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return schedules_service.delete_all_schedules(db=db)
+    return await run_service(db, schedules_service.delete_all_schedules)
 
 
-@router.delete("/{schedule_id}")
-def delete_schedule(
+@router.delete("/{schedule_id}", response_model=ScheduleDeleteResponse)
+async def delete_schedule(
     schedule_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return schedules_service.delete_schedule(db=db, schedule_id=schedule_id)
+    return await run_service(db, schedules_service.delete_schedule, schedule_id=schedule_id)
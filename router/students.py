@@ -1,43 +1,73 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from auth.dependencies import get_current_user, require_admin
-from db.models import Student, get_db
-from db.schemas import StudentCreate, StudentUpdate
-from services import students_service
+from db.models import Student
+from db.schemas import (
+    MessageResponse,
+    Page,
+    Student as StudentSchema,
+    StudentCreate,
+    StudentCreateResponse,
+    StudentUpdate,
+    StudentUpdateResponse,
+)
+from db.session import DbSession, conditional_get, get_read_db, get_session, run_service
+from services import pagination, students_service
+from services.pagination import MAX_PAGE_LIMIT
 
 router = APIRouter(prefix="/students", tags=["학생 관리"])
 
 
-@router.get("/names")
-def get_student_names(
-    db: Session = Depends(get_db),
+def _get_student_names(db: Session) -> dict[int, str]:
+    students = db.query(Student.student_pk, Student.name).all()
+    return {s.student_pk: s.name for s in students}
+
+
+@router.get("/names", response_model=dict[int, str])
+async def get_student_names(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_read_db),
     _: Student = Depends(get_current_user),
 ):
     """모든 학생의 PK와 이름만 반환 (일반 유저도 접근 가능)"""
-    students = db.query(Student.student_pk, Student.name).all()
-    return {s.student_pk: s.name for s in students}
+    return await conditional_get(request, response, db, ("students",), _get_student_names)
 
 
-@router.get("/")
-def get_students(
+@router.get("/", response_model=list[StudentSchema] | Page[StudentSchema])
+async def get_students(
     student_id: str | None = None,
     grade: int | None = None,
     name: str | None = None,
-    db: Session = Depends(get_db),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_LIMIT, description="지정하면 페이지 봉투로 반환"),
+    after: int | None = Query(default=None, description="이전 페이지의 next_after"),
+    fields: str | None = Query(default=None, description="응답에 포함할 컬럼 (쉼표 구분)"),
+    db: DbSession = Depends(get_read_db),
     _: Student = Depends(require_admin),
 ):
-    return students_service.get_students(db=db, student_id=student_id, grade=grade, name=name)
+    result = await run_service(
+        db,
+        students_service.get_students,
+        student_id=student_id,
+        grade=grade,
+        name=name,
+        limit=limit,
+        after=after,
+        fields=fields,
+    )
+    return pagination.projected_response(result) if fields else result
 
 
-@router.post("/")
-def add_student(
+@router.post("/", response_model=StudentCreateResponse)
+async def add_student(
     payload: StudentCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return students_service.add_student(
-        db=db,
+    return await run_service(
+        db,
+        students_service.add_student,
         student_id=payload.student_id,
         name=payload.name,
         grade=payload.grade,
@@ -46,20 +76,20 @@ def add_student(
     )
 
 
-@router.patch("/{student_pk}")
-def update_student(
+@router.patch("/{student_pk}", response_model=StudentUpdateResponse)
+async def update_student(
     student_pk: int,
     update_data: StudentUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return students_service.update_student(db=db, student_pk=student_pk, update_data=update_data)
+    return await run_service(db, students_service.update_student, student_pk=student_pk, update_data=update_data)
 
 
-@router.delete("/{student_pk}")
-def delete_student(
+@router.delete("/{student_pk}", response_model=MessageResponse)
+async def delete_student(
     student_pk: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return students_service.delete_student(db=db, student_pk=student_pk)
+    return await run_service(db, students_service.delete_student, student_pk=student_pk)
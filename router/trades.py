@@ -2,9 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from auth.dependencies import get_current_user, require_admin
-from db.models import Assignment, Student, get_db
-from db.schemas import TradeCreate, TradeUpdate
-from services import trades_service
+from db.models import Assignment, Student
+from db.schemas import (
+    MessageResponse,
+    Page,
+    Trade,
+    TradeCandidatesResponse,
+    TradeCreate,
+    TradeCycleMatchResponse,
+    TradeResponse,
+    TradeUpdate,
+)
+from db.session import DbSession, get_read_db, get_session, run_service
+from services import pagination, trades_service
+from services.pagination import MAX_PAGE_LIMIT
 
 router = APIRouter(prefix="/trades", tags=["청소 교환 관리"])
 
@@ -15,62 +26,111 @@ def _get_student_assignment_ids(db: Session, student_pk: int) -> set[int]:
     return {a.assignment_id for a in assignments}
 
 
-@router.get("/")
-def get_trades(
+@router.get("/", response_model=list[Trade] | Page[Trade])
+async def get_trades(
     request_id: int | None = Query(default=None),
     requester_assignment_id: int | None = Query(default=None),
     target_assignment_id: int | None = Query(default=None),
     status: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    mine: bool | None = Query(default=None, description="본인 배정과 관련된 교환만 조회 (학생은 항상 true)"),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_LIMIT, description="지정하면 페이지 봉투로 반환"),
+    after: int | None = Query(default=None, description="이전 페이지의 next_after"),
+    fields: str | None = Query(default=None, description="응답에 포함할 컬럼 (쉼표 구분)"),
+    db: DbSession = Depends(get_read_db),
     current_user: Student = Depends(get_current_user),
 ):
-    return trades_service.get_trades(
-        db=db,
+    if current_user.role != "관리자":
+        # 학생은 다른 학생의 교환을 볼 수 없으므로 본인 범위를 끌 수 없음
+        if mine is False:
+            raise HTTPException(status_code=403, detail="본인의 교환 요청만 조회할 수 있습니다.")
+        mine = True
+
+    result = await run_service(
+        db,
+        trades_service.get_trades,
         request_id=request_id,
         requester_assignment_id=requester_assignment_id,
         target_assignment_id=target_assignment_id,
         status=status,
+        student_pk=current_user.student_pk if mine else None,
+        limit=limit,
+        after=after,
+        fields=fields,
     )
+    return pagination.projected_response(result) if fields else result
 
 
-@router.post("/")
-def add_trade(
+@router.get("/candidates", response_model=TradeCandidatesResponse)
+async def get_trade_candidates(
+    assignment_id: int = Query(...),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    db: DbSession = Depends(get_read_db),
+    current_user: Student = Depends(get_current_user),
+):
+    if current_user.role != "관리자":
+        my_ids = await run_service(db, _get_student_assignment_ids, current_user.student_pk)
+        if assignment_id not in my_ids:
+            raise HTTPException(status_code=403, detail="본인의 배정만 교환 후보를 조회할 수 있습니다.")
+
+    return await run_service(
+        db,
+        trades_service.get_trade_candidates,
+        assignment_id=assignment_id,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.post("/", response_model=TradeResponse)
+async def add_trade(
     payload: TradeCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     current_user: Student = Depends(get_current_user),
 ):
     if current_user.role != "관리자":
-        my_ids = _get_student_assignment_ids(db, current_user.student_pk)
+        my_ids = await run_service(db, _get_student_assignment_ids, current_user.student_pk)
         if payload.requester_assignment_id not in my_ids:
             raise HTTPException(status_code=403, detail="본인의 배정만 교환 요청할 수 있습니다.")
 
-    return trades_service.add_trade(
-        db=db,
+    return await run_service(
+        db,
+        trades_service.add_trade,
         requester_assignment_id=payload.requester_assignment_id,
         target_assignment_id=payload.target_assignment_id,
     )
 
 
-@router.patch("/{request_id}")
-def update_trade_status(
+@router.post("/match-cycles", response_model=TradeCycleMatchResponse)
+async def match_trade_cycles(
+    max_length: int = Query(default=4, ge=2, le=6, description="순환에 포함할 최대 교환 요청 수"),
+    dry_run: bool = Query(default=False, description="true면 실행하지 않고 성립하는 순환만 반환"),
+    db: DbSession = Depends(get_session),
+    _: Student = Depends(require_admin),
+):
+    return await run_service(db, trades_service.match_trade_cycles, max_length=max_length, dry_run=dry_run)
+
+
+@router.patch("/{request_id}", response_model=TradeResponse)
+async def update_trade_status(
     request_id: int,
     update_data: TradeUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     current_user: Student = Depends(get_current_user),
 ):
     if current_user.role != "관리자":
-        trade = trades_service._get_trade_or_404(db, request_id)
-        my_ids = _get_student_assignment_ids(db, current_user.student_pk)
+        trade = await run_service(db, trades_service._get_trade_or_404, request_id)
+        my_ids = await run_service(db, _get_student_assignment_ids, current_user.student_pk)
         if trade.requester_assignment_id not in my_ids and trade.target_assignment_id not in my_ids:
             raise HTTPException(status_code=403, detail="본인과 관련된 교환만 처리할 수 있습니다.")
 
-    return trades_service.update_trade_status(db=db, request_id=request_id, update_data=update_data)
+    return await run_service(db, trades_service.update_trade_status, request_id=request_id, update_data=update_data)
 
 
-@router.delete("/{request_id}")
-def delete_trade(
+@router.delete("/{request_id}", response_model=MessageResponse)
+async def delete_trade(
     request_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
     _: Student = Depends(require_admin),
 ):
-    return trades_service.delete_trade(db=db, request_id=request_id)
+    return await run_service(db, trades_service.delete_trade, request_id=request_id)
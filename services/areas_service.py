@@ -5,7 +5,7 @@ from db import models, schemas
 
 
 def get_areas(db: Session):
-    return db.query(models.Area).order_by(models.Area.area_id).all()
+    return [schemas.Area.model_validate(area) for area in db.query(models.Area).order_by(models.Area.area_id).all()]
 
 
 def add_area(
@@ -32,7 +32,7 @@ def add_area(
 
     return {
         "message": "청소 구역이 추가되었습니다.",
-        "area": area,
+        "area": schemas.Area.model_validate(area),
     }
 
 
@@ -59,7 +59,7 @@ def update_area(db: Session, area_id: int, update_data: schemas.AreaUpdate):
     db.commit()
     db.refresh(area)
 
-    return {"message": "정보가 수정되었습니다.", "area": area}
+    return {"message": "정보가 수정되었습니다.", "area": schemas.Area.model_validate(area)}
 
 
 def del_area(db: Session, area_id: int):
@@ -0,0 +1,155 @@
+"""학기 전체 자동 배정을 위한 최소 비용 유량(min-cost flow) 엔진
+
+일정마다 [출발 → 구역(need_peoples) → 대상 학년 → 도착] 유량 그래프를 만들고, 학년 → 도착
+간선의 k번째 단위 비용을 해당 학년에서 k번째로 배정 횟수가 적은 학생의 누적 횟수로 둔다.
+구역 → 학년 간선의 비용이 0이므로 최단 증가 경로는 "출발에서 잔여 그래프로 도달 가능한 학년 중
+다음 단위 비용이 가장 작은 학년"이 되고, 이를 반복하는 successive shortest path로 채울 수 있는
+좌석 수를 최대화하면서 누적 횟수 합을 최소화한다. 학생 선택과 횟수 갱신은 학년별 NumPy 배열로
+벡터화하고, 누적 횟수를 다음 일정으로 넘겨 학기 전체를 한 번에 계산한다.
+"""
+import random
+from collections import deque
+
+import numpy as np
+
+
+class _GradeLoads:
+    def __init__(self, student_pks: list[int], counts: dict[int, int]):
+        self.student_pks = np.asarray(student_pks, dtype=np.int64)
+        self.loads = np.asarray([counts.get(student_pk, 0) for student_pk in student_pks], dtype=np.int64)
+
+    def least_loaded(self, limit: int, rng: np.random.Generator) -> np.ndarray:
+        """누적 횟수 오름차순(동률은 랜덤)으로 최대 limit명의 인덱스를 반환"""
+        size = len(self.loads)
+        limit = min(limit, size)
+        if limit < 1:
+            return np.empty(0, dtype=np.int64)
+
+        # 정수 횟수에 [0, 1) 난수를 더해 동률만 랜덤으로 섞음
+        keys = self.loads + rng.random(size)
+        if limit < size:
+            candidates = np.argpartition(keys, limit - 1)[:limit]
+        else:
+            candidates = np.arange(size)
+        return candidates[np.argsort(keys[candidates], kind="stable")]
+
+
+def _find_augmenting_path(
+    remaining_needs: list[int],
+    area_grades: list[list[int]],
+    flows: list[dict[int, int]],
+    next_costs: dict[int, int],
+    rng: random.Random,
+) -> tuple[int, list[tuple[int, int, int]]] | None:
+    # 잔여 그래프 BFS: 출발 → (잔여 인원이 있는) 구역 → 학년, 학년 → 구역은 기존 유량의 역방향 간선
+    grade_parent: dict[int, tuple[int, int | None]] = {}
+    area_parent: dict[int, int | None] = {
+        area_index: None for area_index, remaining in enumerate(remaining_needs) if remaining > 0
+    }
+    queue = deque(area_parent)
+
+    while queue:
+        area_index = queue.popleft()
+        for grade in area_grades[area_index]:
+            if grade in grade_parent:
+                continue
+            grade_parent[grade] = (area_index, area_parent[area_index])
+
+            for next_area_index, area_flows in enumerate(flows):
+                if next_area_index not in area_parent and area_flows.get(grade, 0) > 0:
+                    area_parent[next_area_index] = grade
+                    queue.append(next_area_index)
+
+    reachable_costs = {grade: next_costs[grade] for grade in grade_parent if grade in next_costs}
+    if not reachable_costs:
+        return None
+
+    min_cost = min(reachable_costs.values())
+    grade = rng.choice(sorted(grade for grade, cost in reachable_costs.items() if cost == min_cost))
+
+    # (구역, 학년, +1/-1) 형태로 경로를 복원
+    path: list[tuple[int, int, int]] = []
+    while True:
+        area_index, previous_grade = grade_parent[grade]
+        path.append((area_index, grade, 1))
+        if previous_grade is None:
+            return area_index, path
+        path.append((area_index, previous_grade, -1))
+        grade = previous_grade
+
+
+def _solve_schedule(
+    areas: list[tuple[int, int, tuple[int, ...]]],
+    grade_loads: dict[int, _GradeLoads],
+    rng: random.Random,
+    np_rng: np.random.Generator,
+) -> dict[int, list[int]]:
+    area_grades = [[grade for grade in grade_key if grade in grade_loads] for _, _, grade_key in areas]
+    remaining_needs = [need_peoples for _, need_peoples, _ in areas]
+
+    # 학년마다 이번 일정에서 공급할 수 있는 학생 수만큼 단위 비용을 미리 계산
+    seat_limits: dict[int, int] = {}
+    for area_index, grades in enumerate(area_grades):
+        for grade in grades:
+            seat_limits[grade] = seat_limits.get(grade, 0) + remaining_needs[area_index]
+
+    ordered_students = {
+        grade: grade_loads[grade].least_loaded(seat_limit, np_rng) for grade, seat_limit in seat_limits.items()
+    }
+    used_counts = {grade: 0 for grade in ordered_students}
+    flows: list[dict[int, int]] = [{} for _ in areas]
+
+    while True:
+        next_costs = {
+            grade: int(grade_loads[grade].loads[ordered[used_counts[grade]]])
+            for grade, ordered in ordered_students.items()
+            if used_counts[grade] < len(ordered)
+        }
+        augmenting_path = _find_augmenting_path(remaining_needs, area_grades, flows, next_costs, rng)
+        if augmenting_path is None:
+            break
+
+        source_area_index, path = augmenting_path
+        remaining_needs[source_area_index] -= 1
+        for area_index, grade, delta in path:
+            flows[area_index][grade] = flows[area_index].get(grade, 0) + delta
+        used_counts[path[0][1]] += 1
+
+    # 학년별로 선택된 학생을 구역 유량만큼 나눠 배정하고, 누적 횟수를 벡터 연산으로 갱신
+    selected_by_area: dict[int, list[int]] = {area_id: [] for area_id, _, _ in areas}
+    for grade, used_count in used_counts.items():
+        if used_count < 1:
+            continue
+
+        selected = ordered_students[grade][:used_count]
+        grade_loads[grade].loads[selected] += 1
+        selected_pks = grade_loads[grade].student_pks[selected].tolist()
+
+        offset = 0
+        for area_index, (area_id, _, _) in enumerate(areas):
+            area_flow = flows[area_index].get(grade, 0)
+            selected_by_area[area_id].extend(selected_pks[offset : offset + area_flow])
+            offset += area_flow
+
+    return selected_by_area
+
+
+def solve_term(
+    schedule_ids: list[int],
+    areas: list[tuple[int, int, tuple[int, ...]]],
+    student_pks_by_grade: dict[int, list[int]],
+    counts: dict[int, int],
+    rng: random.Random | None = None,
+) -> dict[int, dict[int, list[int]]]:
+    """일정별 {area_id: [student_pk, ...]} 배정안을 계산
+
+    areas는 (area_id, need_peoples, 대상 학년 튜플) 목록이며, counts의 누적 배정 횟수에서 출발한다.
+    """
+    rng = rng or random.Random()
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    areas = [(area_id, need_peoples, grade_key) for area_id, need_peoples, grade_key in areas if need_peoples > 0]
+    grade_loads = {
+        grade: _GradeLoads(student_pks, counts) for grade, student_pks in student_pks_by_grade.items() if student_pks
+    }
+
+    return {schedule_id: _solve_schedule(areas, grade_loads, rng, np_rng) for schedule_id in schedule_ids}
@@ -0,0 +1,120 @@
+from collections.abc import Iterable
+
+from sqlalchemy import bindparam, case, delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from db import models
+
+EXCLUDED_COUNT_STATUSES = {"취소", "불이행"}
+METRIC_FIELDS = ("cleaning_count", "noncompliance_count", "penalty_count")
+
+_stats_table = models.StudentAssignmentStats.__table__
+
+
+def _status_contribution(status: str) -> tuple[int, int, int]:
+    return (
+        0 if status in EXCLUDED_COUNT_STATUSES else 1,
+        1 if status == "불이행" else 0,
+        1 if status in EXCLUDED_COUNT_STATUSES else 0,
+    )
+
+
+def _ensure_stats_rows(db: Session, student_pks: list[int]) -> None:
+    existing_student_pks = {
+        student_pk
+        for (student_pk,) in db.query(models.StudentAssignmentStats.student_pk)
+        .filter(models.StudentAssignmentStats.student_pk.in_(student_pks))
+        .all()
+    }
+    missing_rows = [
+        {"student_pk": student_pk, "cleaning_count": 0, "noncompliance_count": 0, "penalty_count": 0}
+        for student_pk in student_pks
+        if student_pk not in existing_student_pks
+    ]
+    if not missing_rows:
+        return
+
+    # 학생 행을 잠그지 않으므로 다른 트랜잭션이 같은 학생의 원장 행을 먼저 만들 수 있음 → 충돌은 건너뜀
+    if db.get_bind().dialect.name == "mysql":
+        statement = mysql_insert(_stats_table).on_duplicate_key_update(student_pk=_stats_table.c.student_pk)
+    else:
+        statement = sqlite_insert(_stats_table).on_conflict_do_nothing(index_elements=[_stats_table.c.student_pk])
+    db.execute(statement, missing_rows)
+
+
+def apply_assignment_changes(
+    db: Session,
+    removed: Iterable[tuple[int, str]] = (),
+    added: Iterable[tuple[int, str]] = (),
+) -> None:
+    """배정 (student_pk, status) 행의 삭제/추가분을 원장에 반영 (커밋은 호출자가 수행)"""
+    deltas: dict[int, list[int]] = {}
+    for sign, rows in ((-1, removed), (1, added)):
+        for student_pk, status in rows:
+            student_delta = deltas.setdefault(student_pk, [0, 0, 0])
+            for index, value in enumerate(_status_contribution(status)):
+                student_delta[index] += sign * value
+
+    deltas = {student_pk: delta for student_pk, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+
+    _ensure_stats_rows(db, sorted(deltas))
+
+    # 현재 값에 대한 증감 UPDATE로 반영해 동시 트랜잭션 간 덮어쓰기를 막음
+    db.execute(
+        update(_stats_table)
+        .where(_stats_table.c.student_pk == bindparam("target_student_pk"))
+        .values(
+            cleaning_count=_stats_table.c.cleaning_count + bindparam("cleaning_delta"),
+            noncompliance_count=_stats_table.c.noncompliance_count + bindparam("noncompliance_delta"),
+            penalty_count=_stats_table.c.penalty_count + bindparam("penalty_delta"),
+        ),
+        [
+            {
+                "target_student_pk": student_pk,
+                "cleaning_delta": delta[0],
+                "noncompliance_delta": delta[1],
+                "penalty_delta": delta[2],
+            }
+            for student_pk, delta in sorted(deltas.items())
+        ],
+    )
+
+
+def load_assignment_metrics(db: Session, student_pks: Iterable[int]) -> dict[int, dict[str, int]]:
+    student_pks = list(student_pks)
+    if not student_pks:
+        return {}
+
+    return {
+        stats.student_pk: {field: getattr(stats, field) for field in METRIC_FIELDS}
+        for stats in db.query(models.StudentAssignmentStats)
+        .filter(models.StudentAssignmentStats.student_pk.in_(student_pks))
+        .all()
+    }
+
+
+def rebuild_assignment_stats(db: Session) -> int:
+    """배정 테이블 전체를 다시 집계해 원장을 재작성 (커밋은 호출자가 수행)"""
+    excluded_statuses = sorted(EXCLUDED_COUNT_STATUSES)
+    aggregated = (
+        select(
+            models.Assignment.student_pk,
+            func.sum(case((models.Assignment.status.in_(excluded_statuses), 0), else_=1)),
+            func.sum(case((models.Assignment.status == "불이행", 1), else_=0)),
+            func.sum(case((models.Assignment.status.in_(excluded_statuses), 1), else_=0)),
+        )
+        .group_by(models.Assignment.student_pk)
+    )
+
+    db.execute(delete(_stats_table))
+    result = db.execute(
+        insert(_stats_table).from_select(
+            ["student_pk", "cleaning_count", "noncompliance_count", "penalty_count"],
+            aggregated,
+        )
+    )
+    return result.rowcount
@@ -1,13 +1,36 @@
+import hashlib
+import json
+import os
 import random
+import threading
+import time
 
 from fastapi import HTTPException
-from sqlalchemy import or_
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
 
 from db import models
+from db.table_versions import record_entity_changes
+from events.broker import publish_after_commit
+from services import assignment_solver, assignment_stats_service, pagination
+from services.fairness_pool import FairnessPool
 
 ALLOWED_STATUSES = {"배정", "완료", "취소", "불이행"}
-EXCLUDED_COUNT_STATUSES = {"취소", "불이행"}
+ASSIGNMENT_ENGINES = {"greedy", "optimal"}
+ASSIGNMENT_INSERT_BATCH_SIZE = max(1, int(os.getenv("ASSIGNMENT_INSERT_BATCH_SIZE", "500")))
+ASSIGNMENT_PLAN_TTL_SECONDS = int(os.getenv("ASSIGNMENT_PLAN_TTL_SECONDS", "600"))
+ASSIGNMENT_PLAN_CACHE_SIZE = max(1, int(os.getenv("ASSIGNMENT_PLAN_CACHE_SIZE", "20")))
+LIST_COLUMNS = (
+    models.Assignment.assignment_id,
+    models.Assignment.schedule_id,
+    models.Assignment.student_pk,
+    models.Assignment.area_id,
+    models.Assignment.status,
+)
+
+# 미리보기 배정안 캐시 (프로세스 로컬, plan_id → 배정안). 없으면 plan_id로 다시 계산하므로 최적화 용도
+_assignment_plans: dict[str, dict] = {}
+_assignment_plans_lock = threading.Lock()
 
 
 def _get_assignment_or_404(db: Session, assignment_id: int):
@@ -43,10 +66,39 @@ def _cancel_pending_trades_for_assignment_ids(db: Session, assignment_ids: list[
     )
 
 
+def _get_pending_trade_student_pks(db: Session, assignment_ids: list[int]) -> set[int]:
+    """assignment_ids가 걸린 대기 중 교환 요청의 양쪽 배정 학생"""
+    trade_involves_assignment = or_(
+        models.Trade.requester_assignment_id.in_(assignment_ids),
+        models.Trade.target_assignment_id.in_(assignment_ids),
+    )
+    return {
+        student_pk
+        for (student_pk,) in db.query(models.Assignment.student_pk)
+        .join(
+            models.Trade,
+            or_(
+                models.Trade.requester_assignment_id == models.Assignment.assignment_id,
+                models.Trade.target_assignment_id == models.Assignment.assignment_id,
+            ),
+        )
+        .filter(models.Trade.status == "대기", trade_involves_assignment)
+        .distinct()
+        .all()
+    }
+
+
 def _delete_assignments_by_ids(db: Session, assignment_ids: list[int]) -> tuple[int, int]:
     if not assignment_ids:
         return 0, 0
 
+    deleted_rows = (
+        db.query(models.Assignment.student_pk, models.Assignment.status)
+        .filter(models.Assignment.assignment_id.in_(assignment_ids))
+        .all()
+    )
+    assignment_stats_service.apply_assignment_changes(db, removed=deleted_rows)
+
     deleted_trade_count = (
         db.query(models.Trade)
         .filter(
@@ -66,92 +118,69 @@ def _delete_assignments_by_ids(db: Session, assignment_ids: list[int]) -> tuple[
     return deleted_assignment_count, deleted_trade_count
 
 
-def _load_assignment_metrics(db: Session) -> dict[int, dict[str, int]]:
-    metrics: dict[int, dict[str, int]] = {}
-
-    assignments = db.query(models.Assignment.student_pk, models.Assignment.status).all()
-    for student_pk, status in assignments:
-        student_metrics = metrics.setdefault(
-            student_pk,
-            {
-                "cleaning_count": 0,
-                "noncompliance_count": 0,
-                "penalty_count": 0,
-            },
-        )
-
-        if status not in EXCLUDED_COUNT_STATUSES:
-            student_metrics["cleaning_count"] += 1
-        if status == "불이행":
-            student_metrics["noncompliance_count"] += 1
-        if status in EXCLUDED_COUNT_STATUSES:
-            student_metrics["penalty_count"] += 1
-
-    return metrics
-
-
-def _pick_reassign_student(candidates, metrics: dict[int, dict[str, int]]):
+def _build_reassign_rank(metrics: dict[int, dict[str, int]]):
     # 취소/불이행 이력이 있는 학생이 있으면 우선, 없으면 전체 후보에서 랜덤 재배정
-    metric_rows = [
-        {
-            "student": student,
-            "penalty_count": metrics.get(student.student_pk, {}).get("penalty_count", 0),
-            "noncompliance_count": metrics.get(student.student_pk, {}).get("noncompliance_count", 0),
-            "cleaning_count": metrics.get(student.student_pk, {}).get("cleaning_count", 0),
-        }
-        for student in candidates
-    ]
-
-    prioritized = [metric for metric in metric_rows if metric["penalty_count"] > 0]
-    if not prioritized:
-        return random.choice(candidates)
+    def rank(student_pk: int, cleaning_count: int) -> tuple[int, int, int, int]:
+        student_metrics = metrics.get(student_pk, {})
+        penalty_count = student_metrics.get("penalty_count", 0)
+        if penalty_count < 1:
+            return (1, 0, 0, 0)
+        return (0, -student_metrics.get("noncompliance_count", 0), -penalty_count, cleaning_count)
 
-    max_noncompliance_count = max(metric["noncompliance_count"] for metric in prioritized)
-    noncompliance_top = [
-        metric for metric in prioritized if metric["noncompliance_count"] == max_noncompliance_count
-    ]
-
-    max_penalty_count = max(metric["penalty_count"] for metric in noncompliance_top)
-    penalty_top = [metric for metric in noncompliance_top if metric["penalty_count"] == max_penalty_count]
+    return rank
 
-    min_cleaning_count = min(metric["cleaning_count"] for metric in penalty_top)
-    least_loaded = [metric for metric in penalty_top if metric["cleaning_count"] == min_cleaning_count]
 
-    return random.choice(least_loaded)["student"]
+def _build_reassign_pool(metrics: dict[int, dict[str, int]]) -> FairnessPool:
+    return FairnessPool(
+        counts={student_pk: student_metrics.get("cleaning_count", 0) for student_pk, student_metrics in metrics.items()},
+        rank=_build_reassign_rank(metrics),
+    )
 
 
-def _build_fairness_counts(db: Session) -> dict[int, int]:
-    fairness_counts = {
-        student.student_pk: 0
-        for student in db.query(models.Student)
+def _load_candidate_student_pks_by_grade(db: Session, area_ids: list[int] | None = None) -> dict[int, list[int]]:
+    # 구역 대상 학년 ⨝ 재학생 조인 한 번으로 배정 후보가 될 수 있는 학생만 학년별로 읽음
+    query = (
+        db.query(models.Student.grade, models.Student.student_pk)
+        .join(models.AreaTargetGrade, models.AreaTargetGrade.grade == models.Student.grade)
         .filter(models.Student.status == "재학")
-        .order_by(models.Student.student_pk)
-        .all()
-    }
+    )
+    if area_ids is not None:
+        query = query.filter(models.AreaTargetGrade.area_id.in_(area_ids))
 
-    metrics = _load_assignment_metrics(db)
-    for student_pk in fairness_counts:
-        fairness_counts[student_pk] = metrics.get(student_pk, {}).get("cleaning_count", 0)
+    student_pks_by_grade: dict[int, list[int]] = {}
+    for grade, student_pk in query.distinct().order_by(models.Student.student_pk).all():
+        student_pks_by_grade.setdefault(grade, []).append(student_pk)
 
-    return fairness_counts
+    return student_pks_by_grade
 
 
-def _pick_fair_random_student(candidates, fairness_counts: dict[int, int]):
-    min_count = min(fairness_counts.get(student.student_pk, 0) for student in candidates)
-    least_loaded_candidates = [student for student in candidates if fairness_counts.get(student.student_pk, 0) == min_count]
-    return random.choice(least_loaded_candidates)
+def _get_grade_key(area) -> tuple[int, ...]:
+    return tuple(sorted(set(area.target_grades or [])))
 
 
-def _create_initial_assignments_for_schedule(
-    db: Session,
-    schedule_id: int,
+def _build_fairness_pool(
+    areas,
+    student_pks_by_grade: dict[int, list[int]],
     fairness_counts: dict[int, int],
-) -> tuple[list[models.Assignment], list[dict]]:
-    used_student_pks: set[int] = set()
-    created_assignments: list[models.Assignment] = []
-    unfilled_needs: list[dict] = []
+    rng: random.Random | None = None,
+) -> FairnessPool:
+    fairness_pool = FairnessPool(counts=fairness_counts, rng=rng)
 
-    areas = db.query(models.Area).order_by(models.Area.area_id).all()
+    # 대상 학년 조합이 같은 구역은 같은 후보 그룹을 공유
+    for area in areas:
+        grade_key = _get_grade_key(area)
+        if grade_key in fairness_pool.group_keys:
+            continue
+        fairness_pool.add_group(
+            grade_key,
+            sorted(student_pk for grade in grade_key for student_pk in student_pks_by_grade.get(grade, [])),
+        )
+
+    return fairness_pool
+
+
+def _plan_initial_assignments_for_schedule(areas, fairness_pool: FairnessPool) -> dict[int, list[int]]:
+    selected_by_area: dict[int, list[int]] = {}
 
     # 최소 배정 횟수 그룹 내에서 랜덤 선택해 쏠림을 줄이고, 동률은 랜덤으로 분산
     for area in areas:
@@ -159,36 +188,68 @@ def _create_initial_assignments_for_schedule(
         if required_count < 1:
             continue
 
-        target_grades = area.target_grades or []
-        assigned_count = 0
+        grade_key = _get_grade_key(area)
+        selected_student_pks = selected_by_area.setdefault(area.area_id, [])
 
         for _ in range(required_count):
-            candidates = (
-                db.query(models.Student)
-                .filter(models.Student.status == "재학", models.Student.grade.in_(target_grades))
-                .order_by(models.Student.student_pk)
-                .all()
-            )
-            candidates = [student for student in candidates if student.student_pk not in used_student_pks]
-
-            if not candidates:
+            selected_student_pk = fairness_pool.pick(grade_key)
+            if selected_student_pk is None:
                 break
 
-            selected_student = _pick_fair_random_student(candidates, fairness_counts)
-            assignment = models.Assignment(
-                schedule_id=schedule_id,
-                student_pk=selected_student.student_pk,
-                area_id=area.area_id,
-                status="배정",
-            )
-            db.add(assignment)
-            db.flush()
+            selected_student_pks.append(selected_student_pk)
+            fairness_pool.exclude(selected_student_pk)
+            fairness_pool.increment(selected_student_pk)
+
+    fairness_pool.reset_exclusions()
+    return selected_by_area
+
+
+def _plan_term(
+    schedule_ids: list[int],
+    areas,
+    student_pks_by_grade: dict[int, list[int]],
+    fairness_counts: dict[int, int],
+    engine: str = "greedy",
+    rng: random.Random | None = None,
+) -> dict[int, dict[int, list[int]]]:
+    if engine == "optimal":
+        return assignment_solver.solve_term(
+            schedule_ids=schedule_ids,
+            areas=[(area.area_id, area.need_peoples or 0, _get_grade_key(area)) for area in areas],
+            student_pks_by_grade=student_pks_by_grade,
+            counts=fairness_counts,
+            rng=rng,
+        )
+
+    fairness_pool = _build_fairness_pool(areas, student_pks_by_grade, fairness_counts, rng)
+    return {schedule_id: _plan_initial_assignments_for_schedule(areas, fairness_pool) for schedule_id in schedule_ids}
+
+
+def _format_schedule_plan(
+    schedule_id: int,
+    areas,
+    selected_by_area: dict[int, list[int]],
+) -> tuple[list[dict], list[dict]]:
+    planned_assignments: list[dict] = []
+    unfilled_needs: list[dict] = []
 
-            created_assignments.append(assignment)
-            used_student_pks.add(selected_student.student_pk)
-            fairness_counts[selected_student.student_pk] = fairness_counts.get(selected_student.student_pk, 0) + 1
-            assigned_count += 1
+    for area in areas:
+        required_count = area.need_peoples or 0
+        if required_count < 1:
+            continue
 
+        selected_student_pks = selected_by_area.get(area.area_id, [])
+        planned_assignments.extend(
+            {
+                "schedule_id": schedule_id,
+                "student_pk": student_pk,
+                "area_id": area.area_id,
+                "status": "배정",
+            }
+            for student_pk in selected_student_pks
+        )
+
+        assigned_count = len(selected_student_pks)
         missing_count = required_count - assigned_count
         if missing_count > 0:
             unfilled_needs.append(
@@ -202,7 +263,42 @@ def _create_initial_assignments_for_schedule(
                 }
             )
 
-    return created_assignments, unfilled_needs
+    return planned_assignments, unfilled_needs
+
+
+def _bulk_insert_assignments(db: Session, planned_assignments: list[dict], schedule_ids: list[int]) -> None:
+    # 좌석마다 flush하지 않고 배치 단위 다중 행 INSERT로 기록
+    for offset in range(0, len(planned_assignments), ASSIGNMENT_INSERT_BATCH_SIZE):
+        db.execute(
+            insert(models.Assignment).execution_options(record_changes=False),
+            planned_assignments[offset : offset + ASSIGNMENT_INSERT_BATCH_SIZE],
+        )
+
+    # 배정은 배정이 없는 일정에만 만들어지므로 일정 기준으로 생성된 PK를 읽어 변경 기록에 남김
+    if schedule_ids:
+        created_assignment_ids = [
+            assignment_id
+            for (assignment_id,) in db.query(models.Assignment.assignment_id)
+            .filter(models.Assignment.schedule_id.in_(schedule_ids))
+            .all()
+        ]
+        record_entity_changes(db, models.Assignment.__tablename__, created_assignment_ids)
+
+
+def _load_assignments_by_schedule(db: Session, schedule_ids: list[int]) -> dict[int, list[models.Assignment]]:
+    assignments_by_schedule: dict[int, list[models.Assignment]] = {}
+    if not schedule_ids:
+        return assignments_by_schedule
+
+    for assignment in (
+        db.query(models.Assignment)
+        .filter(models.Assignment.schedule_id.in_(schedule_ids))
+        .order_by(models.Assignment.assignment_id)
+        .all()
+    ):
+        assignments_by_schedule.setdefault(assignment.schedule_id, []).append(assignment)
+
+    return assignments_by_schedule
 
 
 def get_assignments(
@@ -212,8 +308,13 @@ def get_assignments(
     student_pk: int | None = None,
     area_id: int | None = None,
     status: str | None = None,
+    limit: int | None = None,
+    after: int | None = None,
+    fields: str | None = None,
 ):
-    query = db.query(models.Assignment).order_by(models.Assignment.assignment_id)
+    # 목록 응답은 ORM 객체를 만들지 않고 필요한 컬럼만 읽음
+    columns = pagination.select_columns(LIST_COLUMNS, fields, models.Assignment.assignment_id)
+    query = db.query(*columns).order_by(models.Assignment.assignment_id)
 
     if assignment_id is not None:
         matched = query.filter(models.Assignment.assignment_id == assignment_id).all()
@@ -230,70 +331,236 @@ def get_assignments(
     if status is not None:
         query = query.filter(models.Assignment.status == status)
 
-    return query.all()
+    return pagination.paginate(query, models.Assignment.assignment_id, limit=limit, after=after)
 
 
-def add_assignment(db: Session):
-    schedules = (
-        db.query(models.Schedule)
+def _load_term_snapshot(db: Session) -> dict:
+    # 배정 계산에 필요한 입력을 한 번에 읽고, 커밋 시 변경 여부를 비교할 지문을 계산
+    schedule_ids = [
+        schedule_id
+        for (schedule_id,) in db.query(models.Schedule.schedule_id)
         .filter(models.Schedule.status == "예정")
         .order_by(models.Schedule.schedule_id)
         .all()
-    )
-    if not schedules:
-        raise HTTPException(status_code=400, detail="배정 가능한 예정 일정이 없습니다.")
-
+    ]
     existing_schedule_ids = {
         schedule_id
         for (schedule_id,) in db.query(models.Assignment.schedule_id).distinct().all()
     }
+    areas = db.query(models.Area).order_by(models.Area.area_id).all()
+    student_pks_by_grade = _load_candidate_student_pks_by_grade(db)
+    student_pks = [student_pk for grade_student_pks in student_pks_by_grade.values() for student_pk in grade_student_pks]
+    metrics = assignment_stats_service.load_assignment_metrics(db, student_pks)
+    fairness_counts = {student_pk: metrics.get(student_pk, {}).get("cleaning_count", 0) for student_pk in student_pks}
+
+    fingerprint_source = json.dumps(
+        {
+            "schedule_ids": schedule_ids,
+            "existing_schedule_ids": sorted(existing_schedule_ids & set(schedule_ids)),
+            "areas": [[area.area_id, area.name, area.need_peoples, list(_get_grade_key(area))] for area in areas],
+            "students": sorted([grade, grade_student_pks] for grade, grade_student_pks in student_pks_by_grade.items()),
+            "fairness_counts": sorted(fairness_counts.items()),
+        },
+        ensure_ascii=False,
+    )
+
+    return {
+        "schedule_ids": schedule_ids,
+        "existing_schedule_ids": existing_schedule_ids,
+        "areas": areas,
+        "student_pks_by_grade": student_pks_by_grade,
+        "fairness_counts": fairness_counts,
+        "fingerprint": hashlib.sha256(fingerprint_source.encode("utf-8")).hexdigest(),
+    }
+
+
+def _plan_from_snapshot(snapshot: dict, engine: str, rng: random.Random | None = None) -> dict:
+    existing_schedule_ids = snapshot["existing_schedule_ids"]
+    areas = snapshot["areas"]
 
-    total_created = 0
-    created_results: list[dict] = []
+    planned_results: list[dict] = []
+    planned_assignments: list[dict] = []
     skipped_schedule_ids: list[int] = []
     total_unfilled_needs: list[dict] = []
-    fairness_counts = _build_fairness_counts(db)
 
-    for schedule in schedules:
-        if schedule.schedule_id in existing_schedule_ids:
-            skipped_schedule_ids.append(schedule.schedule_id)
+    pending_schedule_ids = [
+        schedule_id for schedule_id in snapshot["schedule_ids"] if schedule_id not in existing_schedule_ids
+    ]
+    term_plan = _plan_term(
+        pending_schedule_ids,
+        areas,
+        snapshot["student_pks_by_grade"],
+        snapshot["fairness_counts"],
+        engine,
+        rng,
+    )
+
+    for schedule_id in snapshot["schedule_ids"]:
+        if schedule_id in existing_schedule_ids:
+            skipped_schedule_ids.append(schedule_id)
             continue
 
-        created_assignments, unfilled_needs = _create_initial_assignments_for_schedule(
-            db=db,
-            schedule_id=schedule.schedule_id,
-            fairness_counts=fairness_counts,
-        )
-        if created_assignments:
-            total_created += len(created_assignments)
-            created_results.append(
+        schedule_assignments, unfilled_needs = _format_schedule_plan(schedule_id, areas, term_plan[schedule_id])
+        if schedule_assignments:
+            planned_assignments.extend(schedule_assignments)
+            planned_results.append(
                 {
-                    "schedule_id": schedule.schedule_id,
-                    "created_count": len(created_assignments),
-                    "assignments": created_assignments,
+                    "schedule_id": schedule_id,
+                    "created_count": len(schedule_assignments),
+                    "assignments": schedule_assignments,
                     "unfilled_needs": unfilled_needs,
                 }
             )
-            total_unfilled_needs.extend(unfilled_needs)
         else:
-            skipped_schedule_ids.append(schedule.schedule_id)
-            total_unfilled_needs.extend(unfilled_needs)
+            skipped_schedule_ids.append(schedule_id)
+        total_unfilled_needs.extend(unfilled_needs)
 
-    if total_created == 0:
-        raise HTTPException(status_code=400, detail="배정 가능한 일정이 없습니다.")
+    return {
+        "engine": engine,
+        "fingerprint": snapshot["fingerprint"],
+        "planned_assignments": planned_assignments,
+        "results": planned_results,
+        "skipped_schedule_ids": skipped_schedule_ids,
+        "total_unfilled_needs": total_unfilled_needs,
+    }
+
+
+def _commit_plan(db: Session, plan: dict) -> dict:
+    planned_assignments = plan["planned_assignments"]
+    schedule_ids = [result["schedule_id"] for result in plan["results"]]
 
+    _bulk_insert_assignments(db, planned_assignments, schedule_ids)
+    assignment_stats_service.apply_assignment_changes(
+        db,
+        added=[(row["student_pk"], row["status"]) for row in planned_assignments],
+    )
     db.commit()
 
+    # 생성된 일정의 배정을 한 번에 다시 읽어 PK를 채움
+    created_by_schedule = _load_assignments_by_schedule(db, schedule_ids)
+
+    created_results = [
+        {
+            "schedule_id": result["schedule_id"],
+            "created_count": len(created_by_schedule.get(result["schedule_id"], [])),
+            "assignments": created_by_schedule.get(result["schedule_id"], []),
+            "unfilled_needs": result["unfilled_needs"],
+        }
+        for result in plan["results"]
+    ]
+
     return {
         "message": "전체 일정 자동 배정이 완료되었습니다.",
         "created_schedule_count": len(created_results),
-        "total_created_count": total_created,
+        "total_created_count": len(planned_assignments),
         "results": created_results,
-        "skipped_schedule_ids": skipped_schedule_ids,
-        "total_unfilled_needs": total_unfilled_needs,
+        "skipped_schedule_ids": plan["skipped_schedule_ids"],
+        "total_unfilled_needs": plan["total_unfilled_needs"],
     }
 
 
+def _format_plan_preview(plan_id: str, plan: dict) -> dict:
+    return {
+        "message": "배정안을 미리 계산했습니다. 적용하려면 배정안을 커밋하세요.",
+        "plan_id": plan_id,
+        "dry_run": True,
+        "engine": plan["engine"],
+        "seed": plan["seed"],
+        "created_schedule_count": len(plan["results"]),
+        "total_created_count": len(plan["planned_assignments"]),
+        "results": plan["results"],
+        "skipped_schedule_ids": plan["skipped_schedule_ids"],
+        "total_unfilled_needs": plan["total_unfilled_needs"],
+    }
+
+
+def _purge_expired_plans(now: float) -> None:
+    expired_plan_ids = [
+        plan_id
+        for plan_id, plan in _assignment_plans.items()
+        if now - plan["created_at"] > ASSIGNMENT_PLAN_TTL_SECONDS
+    ]
+    for plan_id in expired_plan_ids:
+        del _assignment_plans[plan_id]
+
+
+def _make_plan_id(engine: str, seed: int, fingerprint: str) -> str:
+    # 배정안은 (엔진, 시드, 스냅샷 지문)으로 결정되므로 ID에 담아 어느 워커에서든 다시 계산할 수 있게 함
+    return f"{engine}.{seed}.{fingerprint}"
+
+
+def _parse_plan_id(plan_id: str) -> tuple[str, int, str]:
+    parts = plan_id.split(".")
+    if len(parts) != 3 or parts[0] not in ASSIGNMENT_ENGINES or not parts[1].isdigit():
+        raise HTTPException(status_code=404, detail="배정안을 찾을 수 없습니다.")
+    return parts[0], int(parts[1]), parts[2]
+
+
+def _store_plan(plan_id: str, plan: dict) -> None:
+    with _assignment_plans_lock:
+        now = time.monotonic()
+        _purge_expired_plans(now)
+        _assignment_plans.pop(plan_id, None)
+        while len(_assignment_plans) >= ASSIGNMENT_PLAN_CACHE_SIZE:
+            del _assignment_plans[next(iter(_assignment_plans))]
+        _assignment_plans[plan_id] = {**plan, "created_at": now}
+
+
+def _find_cached_plan(plan_id: str) -> dict | None:
+    # 캐시는 재계산을 피하는 용도일 뿐이며, 없으면(다른 워커, 만료) ID로 다시 계산
+    with _assignment_plans_lock:
+        _purge_expired_plans(time.monotonic())
+        return _assignment_plans.get(plan_id)
+
+
+def _build_plan(snapshot: dict, engine: str, seed: int | None) -> dict:
+    rng = random.Random(seed) if seed is not None else None
+    plan = _plan_from_snapshot(snapshot, engine, rng)
+    if not plan["planned_assignments"]:
+        raise HTTPException(status_code=400, detail="배정 가능한 일정이 없습니다.")
+    plan["seed"] = seed
+    return plan
+
+
+def add_assignment(db: Session, engine: str = "greedy", dry_run: bool = False, seed: int | None = None):
+    if engine not in ASSIGNMENT_ENGINES:
+        raise HTTPException(status_code=400, detail="유효하지 않은 배정 엔진입니다.")
+
+    # 재학생 명단과 구역 정보는 한 번만 읽고, 모든 일정의 좌석을 메모리 후보 풀에서 배정
+    snapshot = _load_term_snapshot(db)
+    if not snapshot["schedule_ids"]:
+        raise HTTPException(status_code=400, detail="배정 가능한 예정 일정이 없습니다.")
+
+    if not dry_run:
+        return _commit_plan(db, _build_plan(snapshot, engine, seed))
+
+    # 미리보기는 커밋 때 같은 배정안을 다시 만들 수 있도록 시드를 정해 둠
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**31)
+    plan_id = _make_plan_id(engine, seed, snapshot["fingerprint"])
+    plan = _find_cached_plan(plan_id)
+    if plan is None:
+        plan = _build_plan(snapshot, engine, seed)
+        _store_plan(plan_id, plan)
+    return _format_plan_preview(plan_id, plan)
+
+
+def commit_assignment_plan(db: Session, plan_id: str):
+    engine, seed, fingerprint = _parse_plan_id(plan_id)
+
+    snapshot = _load_term_snapshot(db)
+    if snapshot["fingerprint"] != fingerprint:
+        raise HTTPException(
+            status_code=409,
+            detail="배정안 계산 이후 학생/구역/일정/배정 정보가 변경되어 적용할 수 없습니다. 다시 계산해주세요.",
+        )
+
+    plan = _find_cached_plan(plan_id) or _build_plan(snapshot, engine, seed)
+    with _assignment_plans_lock:
+        _assignment_plans.pop(plan_id, None)
+    return _commit_plan(db, plan)
+
+
 def update_assignment_status(db: Session, assignment_id: int, status: str):
     assignment = _get_assignment_or_404(db, assignment_id)
 
@@ -301,9 +568,25 @@ def update_assignment_status(db: Session, assignment_id: int, status: str):
         raise HTTPException(status_code=400, detail="유효하지 않은 청소 현황 값입니다.")
 
     canceled_trade_count = 0
+    assignment_stats_service.apply_assignment_changes(
+        db,
+        removed=[(assignment.student_pk, assignment.status)],
+        added=[(assignment.student_pk, status)],
+    )
     assignment.status = status
+    publish_after_commit(
+        db,
+        (assignment.student_pk,),
+        "assignment.updated",
+        assignment_id=assignment.assignment_id,
+        status=status,
+    )
     if status == "취소":
+        # 대기 중 교환이 함께 취소되는 상대 학생에게도 알림
+        trade_student_pks = _get_pending_trade_student_pks(db, [assignment.assignment_id])
         canceled_trade_count = _cancel_pending_trades_for_assignment_ids(db, [assignment.assignment_id])
+        if canceled_trade_count:
+            publish_after_commit(db, trade_student_pks, "trades.canceled", assignment_id=assignment.assignment_id)
     db.commit()
     db.refresh(assignment)
 
@@ -339,21 +622,37 @@ def reassign_canceled_assignment(db: Session, assignment_id: int):
         .all()
     }
 
-    candidates = (
-        db.query(models.Student)
-        .filter(models.Student.status == "재학", models.Student.grade.in_(area.target_grades or []))
+    candidate_student_pks = [
+        student_pk
+        for (student_pk,) in db.query(models.Student.student_pk)
+        .join(models.AreaTargetGrade, models.AreaTargetGrade.grade == models.Student.grade)
+        .filter(models.AreaTargetGrade.area_id == area.area_id, models.Student.status == "재학")
         .order_by(models.Student.student_pk)
         .all()
-    )
-    candidates = [student for student in candidates if student.student_pk not in assigned_student_pks]
+        if student_pk not in assigned_student_pks
+    ]
 
-    if not candidates:
+    if not candidate_student_pks:
         raise HTTPException(status_code=400, detail="재배정 가능한 학생이 없습니다.")
 
-    metrics = _load_assignment_metrics(db)
-    selected_student = _pick_reassign_student(candidates, metrics)
+    metrics = assignment_stats_service.load_assignment_metrics(db, candidate_student_pks)
+    reassign_pool = _build_reassign_pool(metrics)
+    reassign_pool.add_group(area.area_id, candidate_student_pks)
+    selected_student_pk = reassign_pool.pick(area.area_id)
 
-    assignment.student_pk = selected_student.student_pk
+    assignment_stats_service.apply_assignment_changes(
+        db,
+        removed=[(assignment.student_pk, assignment.status)],
+        added=[(selected_student_pk, "배정")],
+    )
+    publish_after_commit(
+        db,
+        (assignment.student_pk, selected_student_pk),
+        "assignment.reassigned",
+        assignment_id=assignment.assignment_id,
+        status="배정",
+    )
+    assignment.student_pk = selected_student_pk
     assignment.status = "배정"
     db.commit()
     db.refresh(assignment)
@@ -361,7 +660,132 @@ def reassign_canceled_assignment(db: Session, assignment_id: int):
     return {
         "message": "재배정이 완료되었습니다.",
         "assignment": assignment,
-        "selected_student_cleaning_count": metrics.get(selected_student.student_pk, {}).get("cleaning_count", 0) + 1,
+        "selected_student_cleaning_count": metrics.get(selected_student_pk, {}).get("cleaning_count", 0) + 1,
+    }
+
+
+def reassign_canceled_assignments(db: Session, schedule_id: int | None = None):
+    if schedule_id is not None:
+        schedule = db.query(models.Schedule).filter(models.Schedule.schedule_id == schedule_id).first()
+        if not schedule:
+            raise HTTPException(status_code=404, detail="해당 일정이 존재하지 않습니다.")
+        schedule_ids = [schedule_id]
+    else:
+        schedule_ids = [
+            upcoming_schedule_id
+            for (upcoming_schedule_id,) in db.query(models.Schedule.schedule_id)
+            .filter(models.Schedule.status == "예정")
+            .all()
+        ]
+
+    canceled_assignments = []
+    if schedule_ids:
+        canceled_assignments = (
+            db.query(models.Assignment)
+            .filter(models.Assignment.schedule_id.in_(schedule_ids), models.Assignment.status == "취소")
+            .order_by(models.Assignment.schedule_id, models.Assignment.assignment_id)
+            .all()
+        )
+    if not canceled_assignments:
+        raise HTTPException(status_code=400, detail="재배정할 취소된 배정이 없습니다.")
+
+    # 일정별 배정 학생, 구역, 후보, 지표를 한 번씩만 읽고 이후에는 메모리에서 갱신
+    target_schedule_ids = sorted({assignment.schedule_id for assignment in canceled_assignments})
+    assigned_student_pks_by_schedule: dict[int, set[int]] = {}
+    for assigned_schedule_id, student_pk in (
+        db.query(models.Assignment.schedule_id, models.Assignment.student_pk)
+        .filter(models.Assignment.schedule_id.in_(target_schedule_ids), models.Assignment.status != "취소")
+        .all()
+    ):
+        assigned_student_pks_by_schedule.setdefault(assigned_schedule_id, set()).add(student_pk)
+
+    areas = (
+        db.query(models.Area)
+        .filter(models.Area.area_id.in_({assignment.area_id for assignment in canceled_assignments}))
+        .all()
+    )
+    student_pks_by_grade = _load_candidate_student_pks_by_grade(db, [area.area_id for area in areas])
+    student_pks = [student_pk for grade_student_pks in student_pks_by_grade.values() for student_pk in grade_student_pks]
+    metric_student_pks = set(student_pks) | {assignment.student_pk for assignment in canceled_assignments}
+    metrics = assignment_stats_service.load_assignment_metrics(db, metric_student_pks)
+    for student_pk in metric_student_pks:
+        metrics.setdefault(student_pk, {"cleaning_count": 0, "noncompliance_count": 0, "penalty_count": 0})
+
+    reassign_pool = _build_reassign_pool(metrics)
+    for area in areas:
+        reassign_pool.add_group(
+            area.area_id,
+            sorted(student_pk for grade in _get_grade_key(area) for student_pk in student_pks_by_grade.get(grade, [])),
+        )
+
+    results: list[dict] = []
+    removed_rows: list[tuple[int, str]] = []
+    added_rows: list[tuple[int, str]] = []
+    current_schedule_id = None
+
+    for assignment in canceled_assignments:
+        if assignment.schedule_id != current_schedule_id:
+            reassign_pool.reset_exclusions()
+            current_schedule_id = assignment.schedule_id
+            for student_pk in assigned_student_pks_by_schedule.get(current_schedule_id, ()):
+                reassign_pool.exclude(student_pk)
+
+        previous_student_pk = assignment.student_pk
+        selected_student_pk = reassign_pool.pick(assignment.area_id)
+        if selected_student_pk is None:
+            results.append(
+                {
+                    "assignment_id": assignment.assignment_id,
+                    "schedule_id": assignment.schedule_id,
+                    "area_id": assignment.area_id,
+                    "previous_student_pk": previous_student_pk,
+                    "student_pk": None,
+                    "reassigned": False,
+                    "detail": "재배정 가능한 학생이 없습니다.",
+                }
+            )
+            continue
+
+        removed_rows.append((previous_student_pk, assignment.status))
+        added_rows.append((selected_student_pk, "배정"))
+        assignment.student_pk = selected_student_pk
+        assignment.status = "배정"
+        publish_after_commit(
+            db,
+            (previous_student_pk, selected_student_pk),
+            "assignment.reassigned",
+            assignment_id=assignment.assignment_id,
+            status="배정",
+        )
+
+        # 취소 이력은 새 학생의 배정으로 바뀌므로 이전 학생의 패널티를 되돌림
+        metrics[previous_student_pk]["penalty_count"] -= 1
+        reassign_pool.refresh(previous_student_pk)
+        reassign_pool.exclude(selected_student_pk)
+        reassign_pool.increment(selected_student_pk)
+
+        results.append(
+            {
+                "assignment_id": assignment.assignment_id,
+                "schedule_id": assignment.schedule_id,
+                "area_id": assignment.area_id,
+                "previous_student_pk": previous_student_pk,
+                "student_pk": selected_student_pk,
+                "reassigned": True,
+                "selected_student_cleaning_count": reassign_pool.count(selected_student_pk),
+            }
+        )
+
+    assignment_stats_service.apply_assignment_changes(db, removed=removed_rows, added=added_rows)
+    db.commit()
+
+    reassigned_count = sum(1 for result in results if result["reassigned"])
+    return {
+        "message": "취소된 배정의 일괄 재배정이 완료되었습니다.",
+        "schedule_id": schedule_id,
+        "reassigned_count": reassigned_count,
+        "failed_count": len(results) - reassigned_count,
+        "results": results,
     }
 
 
@@ -1,12 +1,33 @@
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from auth.security import hash_password, verify_password
+from auth.cache import invalidate_principal
+from auth.hashing import hash_password_async, verify_password_async
+from auth.security import needs_rehash
 from db import models
+from db.session import run_service
 
 
-def authenticate_user(db: Session, student_id: str, password: str) -> models.Student:
-    student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
+def _get_student_by_student_id(db: Session, student_id: str) -> models.Student | None:
+    return db.query(models.Student).filter(models.Student.student_id == student_id).first()
+
+
+def _get_student_by_pk(db: Session, student_pk: int) -> models.Student | None:
+    return db.query(models.Student).filter(models.Student.student_pk == student_pk).first()
+
+
+def _commit(db: Session) -> None:
+    db.commit()
+
+
+def _commit_and_refresh(db: Session, student: models.Student) -> None:
+    db.commit()
+    db.refresh(student)
+
+
+async def authenticate_user(db: Session | AsyncSession, student_id: str, password: str) -> models.Student:
+    student = await run_service(db, _get_student_by_student_id, student_id)
     if not student:
         raise HTTPException(status_code=401, detail="학번 또는 비밀번호가 올바르지 않습니다.")
 
@@ -17,33 +38,49 @@ def authenticate_user(db: Session, student_id: str, password: str) -> models.Stu
             headers={"X-Password-Setup-Required": "true"},
         )
 
-    if not verify_password(password, student.password_hash):
+    if not await verify_password_async(password, student.password_hash):
         raise HTTPException(status_code=401, detail="학번 또는 비밀번호가 올바르지 않습니다.")
 
+    # 설정된 bcrypt 비용이 바뀌었으면 로그인 시점에 새 비용으로 다시 해시
+    if needs_rehash(student.password_hash):
+        try:
+            student.password_hash = await hash_password_async(password)
+        except HTTPException:
+            # 해시 풀이 가득 찼으면 재해시는 다음 로그인으로 미룸
+            return student
+        await run_service(db, _commit_and_refresh, student)
+        invalidate_principal(student.student_pk)
+
     return student
 
 
-def set_password(db: Session, student_pk: int, current_password: str | None, new_password: str) -> None:
-    student = db.query(models.Student).filter(models.Student.student_pk == student_pk).first()
+async def set_password(
+    db: Session | AsyncSession,
+    student_pk: int,
+    current_password: str | None,
+    new_password: str,
+) -> None:
+    student = await run_service(db, _get_student_by_pk, student_pk)
     if not student:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
     if student.password_hash is not None:
         if current_password is None:
             raise HTTPException(status_code=400, detail="현재 비밀번호를 입력해주세요.")
-        if not verify_password(current_password, student.password_hash):
+        if not await verify_password_async(current_password, student.password_hash):
             raise HTTPException(status_code=400, detail="현재 비밀번호가 올바르지 않습니다.")
 
     if len(new_password) < 4:
         raise HTTPException(status_code=400, detail="비밀번호는 4자 이상이어야 합니다.")
 
-    student.password_hash = hash_password(new_password)
-    db.commit()
+    student.password_hash = await hash_password_async(new_password)
+    await run_service(db, _commit)
+    invalidate_principal(student_pk)
 
 
-def setup_initial_password(db: Session, student_id: str, new_password: str) -> models.Student:
+async def setup_initial_password(db: Session | AsyncSession, student_id: str, new_password: str) -> models.Student:
     """비밀번호가 없는 사용자의 초기 비밀번호 설정"""
-    student = db.query(models.Student).filter(models.Student.student_id == student_id).first()
+    student = await run_service(db, _get_student_by_student_id, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="존재하지 않는 학번입니다.")
 
@@ -53,7 +90,7 @@ def setup_initial_password(db: Session, student_id: str, new_password: str) -> m
     if len(new_password) < 4:
         raise HTTPException(status_code=400, detail="비밀번호는 4자 이상이어야 합니다.")
 
-    student.password_hash = hash_password(new_password)
-    db.commit()
-    db.refresh(student)
+    student.password_hash = await hash_password_async(new_password)
+    await run_service(db, _commit_and_refresh, student)
+    invalidate_principal(student.student_pk)
     return student
@@ -0,0 +1,76 @@
+"""change_log 기반 증분 동기화
+
+since 커서(커밋 순번) 이후의 변경을 엔티티별로 압축해, 지금도 있는 엔티티는 현재 행(upserts)으로,
+없어진 엔티티는 ID(deletes)로 반환한다. 같은 엔티티가 여러 번 바뀌었어도 한 번만 포함된다.
+"""
+import os
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from db import models, schemas
+from services import assignments_service, schedules_service, students_service, trades_service
+
+CHANGE_FEED_LIMIT = int(os.getenv("CHANGE_FEED_LIMIT", "1000"))
+
+# 엔티티 → (ID 컬럼, 목록 컬럼)
+_ENTITY_COLUMNS = {
+    "students": (models.Student.student_pk, students_service.LIST_COLUMNS),
+    "schedules": (models.Schedule.schedule_id, schedules_service.LIST_COLUMNS),
+    "assignments": (models.Assignment.assignment_id, assignments_service.LIST_COLUMNS),
+    "trades": (models.Trade.request_id, trades_service.LIST_COLUMNS),
+}
+
+
+def _load_current_rows(db: Session, entity: str, entity_ids: set[int]) -> list:
+    if entity == "areas":
+        return [
+            schemas.Area.model_validate(area)
+            for area in db.query(models.Area).filter(models.Area.area_id.in_(entity_ids)).order_by(models.Area.area_id)
+        ]
+
+    id_column, columns = _ENTITY_COLUMNS[entity]
+    return db.query(*columns).filter(id_column.in_(entity_ids)).order_by(id_column).all()
+
+
+def get_changes(db: Session, since: int | None = None, limit: int = CHANGE_FEED_LIMIT):
+    # 커서 없이 부르면 현재 위치만 반환 (전체 조회 전에 받아 두고 이후 변경을 since로 조회)
+    if since is None:
+        cursor = db.query(func.max(models.ChangeLog.version)).scalar() or 0
+        return {"cursor": cursor, "has_more": False, "resets": [], "upserts": {}, "deletes": {}}
+
+    rows = (
+        db.query(models.ChangeLog.version, models.ChangeLog.entity, models.ChangeLog.entity_id)
+        .filter(models.ChangeLog.version > since)
+        .order_by(models.ChangeLog.version)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    resets = {row.entity for row in rows if row.entity_id is None}
+    changed_ids: dict[str, set[int]] = {}
+    for row in rows:
+        if row.entity_id is not None and row.entity not in resets:
+            changed_ids.setdefault(row.entity, set()).add(row.entity_id)
+
+    # 작업 종류 대신 현재 상태로 판단: 남아 있으면 upsert, 없으면 delete
+    upserts: dict[str, list] = {}
+    deletes: dict[str, list[int]] = {}
+    for entity, entity_ids in changed_ids.items():
+        current_rows = _load_current_rows(db, entity, entity_ids)
+        id_key = "area_id" if entity == "areas" else _ENTITY_COLUMNS[entity][0].key
+        existing_ids = {getattr(row, id_key) for row in current_rows}
+        if current_rows:
+            upserts[entity] = current_rows
+        if entity_ids - existing_ids:
+            deletes[entity] = sorted(entity_ids - existing_ids)
+
+    return {
+        "cursor": rows[-1].version if rows else since,
+        "has_more": has_more,
+        "resets": sorted(resets),
+        "upserts": upserts,
+        "deletes": deletes,
+    }
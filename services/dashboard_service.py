@@ -0,0 +1,73 @@
+"""학생 대시보드 한 번에 조회
+
+유저 페이지가 배정·구역·일정·교환·학생 이름을 각각 요청하던 것을 한 세션의 몇 개 쿼리로 모은다.
+구역·일정·학생 이름은 전체 목록 대신 내 배정과 교환 상대 배정이 참조하는 것만 반환한다.
+"""
+from sqlalchemy.orm import Session
+
+from db import models, schemas
+from services import assignments_service, schedules_service, trades_service
+
+
+def get_dashboard(db: Session, student_pk: int):
+    assignments = (
+        db.query(*assignments_service.LIST_COLUMNS)
+        .filter(models.Assignment.student_pk == student_pk)
+        .order_by(models.Assignment.assignment_id)
+        .all()
+    )
+    trades = trades_service.get_trades(db, student_pk=student_pk)
+
+    # 교환 상대 배정 (교환 요청 중 내 배정이 아닌 쪽)
+    my_assignment_ids = {assignment.assignment_id for assignment in assignments}
+    counterpart_ids = {
+        assignment_id
+        for trade in trades
+        for assignment_id in (trade.requester_assignment_id, trade.target_assignment_id)
+        if assignment_id not in my_assignment_ids
+    }
+    counterpart_assignments = []
+    if counterpart_ids:
+        counterpart_assignments = (
+            db.query(*assignments_service.LIST_COLUMNS)
+            .filter(models.Assignment.assignment_id.in_(counterpart_ids))
+            .order_by(models.Assignment.assignment_id)
+            .all()
+        )
+
+    referenced = assignments + counterpart_assignments
+    schedule_ids = {assignment.schedule_id for assignment in referenced}
+    area_ids = {assignment.area_id for assignment in referenced}
+
+    schedules = []
+    if schedule_ids:
+        schedules = (
+            db.query(*schedules_service.LIST_COLUMNS)
+            .filter(models.Schedule.schedule_id.in_(schedule_ids))
+            .order_by(models.Schedule.cleaning_date)
+            .all()
+        )
+    areas = []
+    if area_ids:
+        areas = [
+            schemas.Area.model_validate(area)
+            for area in db.query(models.Area).filter(models.Area.area_id.in_(area_ids)).order_by(models.Area.area_id)
+        ]
+
+    student_pks = {assignment.student_pk for assignment in referenced}
+    student_names = {}
+    if student_pks:
+        student_names = dict(
+            db.query(models.Student.student_pk, models.Student.name)
+            .filter(models.Student.student_pk.in_(student_pks))
+            .all()
+        )
+
+    return {
+        "assignments": assignments,
+        "trades": trades,
+        "counterpart_assignments": counterpart_assignments,
+        "schedules": schedules,
+        "areas": areas,
+        "student_names": student_names,
+    }
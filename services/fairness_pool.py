@@ -0,0 +1,129 @@
+import heapq
+import random
+from collections.abc import Callable, Hashable, Iterable
+
+
+def _count_rank(_: int, count: int) -> int:
+    return count
+
+
+class _RankedGroup:
+    """같은 순위(rank)의 학생을 버킷으로 묶어, 최소 순위 버킷에서 O(1)로 랜덤 선택"""
+
+    def __init__(self):
+        self._buckets: dict[Hashable, list[int]] = {}
+        self._positions: dict[int, int] = {}
+        self._ranks: dict[int, Hashable] = {}
+        self._rank_heap: list = []
+
+    def add(self, student_pk: int, rank) -> None:
+        bucket = self._buckets.get(rank)
+        if bucket is None:
+            bucket = self._buckets[rank] = []
+            heapq.heappush(self._rank_heap, rank)
+
+        self._positions[student_pk] = len(bucket)
+        self._ranks[student_pk] = rank
+        bucket.append(student_pk)
+
+    def remove(self, student_pk: int) -> None:
+        rank = self._ranks.pop(student_pk)
+        position = self._positions.pop(student_pk)
+        bucket = self._buckets[rank]
+
+        # 마지막 원소를 빈 자리로 옮겨 O(1) 삭제
+        last_student_pk = bucket.pop()
+        if last_student_pk != student_pk:
+            bucket[position] = last_student_pk
+            self._positions[last_student_pk] = position
+
+        # 빈 버킷의 힙 항목은 pick에서 지연 삭제
+        if not bucket:
+            del self._buckets[rank]
+
+    def pick(self, rng) -> int | None:
+        while self._rank_heap:
+            bucket = self._buckets.get(self._rank_heap[0])
+            if bucket:
+                return bucket[rng.randrange(len(bucket))]
+            heapq.heappop(self._rank_heap)
+        return None
+
+
+class FairnessPool:
+    """학생별 배정 횟수를 공유하는 후보 그룹 모음
+
+    후보 그룹(예: 구역의 대상 학년 조합)마다 순위 버킷을 유지하고, 한 학생이 여러
+    그룹에 속해도 배정 횟수는 하나로 관리한다. 최소 순위 선택은 O(1)(지연 삭제 포함
+    분할 상환 O(log n)), 횟수 증가와 일정 단위 제외는 소속 그룹 수만큼 O(log n)이다.
+    순위는 rank(student_pk, count)로 계산하며 기본값은 배정 횟수 자체다.
+    """
+
+    def __init__(
+        self,
+        counts: dict[int, int],
+        rank: Callable[[int, int], Hashable] | None = None,
+        rng: random.Random | None = None,
+    ):
+        self._counts = dict(counts)
+        self._rank = rank or _count_rank
+        self._rng = rng or random
+        self._groups: dict[Hashable, _RankedGroup] = {}
+        self._memberships: dict[int, list[_RankedGroup]] = {}
+        self._excluded: set[int] = set()
+
+    @property
+    def counts(self) -> dict[int, int]:
+        return self._counts
+
+    @property
+    def group_keys(self):
+        return self._groups.keys()
+
+    def count(self, student_pk: int) -> int:
+        return self._counts.get(student_pk, 0)
+
+    def add_group(self, group_key: Hashable, student_pks: Iterable[int]) -> None:
+        group = self._groups[group_key] = _RankedGroup()
+        for student_pk in student_pks:
+            self._counts.setdefault(student_pk, 0)
+            self._memberships.setdefault(student_pk, []).append(group)
+            if student_pk not in self._excluded:
+                group.add(student_pk, self._rank(student_pk, self._counts[student_pk]))
+
+    def pick(self, group_key: Hashable) -> int | None:
+        """그룹에서 제외되지 않은 최소 순위 학생을 랜덤으로 선택 (없으면 None)"""
+        group = self._groups.get(group_key)
+        if group is None:
+            return None
+        return group.pick(self._rng)
+
+    def increment(self, student_pk: int) -> None:
+        self._counts[student_pk] = self._counts.get(student_pk, 0) + 1
+        self.refresh(student_pk)
+
+    def refresh(self, student_pk: int) -> None:
+        """rank 함수가 참조하는 외부 지표가 바뀐 학생의 순위를 다시 계산"""
+        if student_pk in self._excluded:
+            return
+
+        rank = self._rank(student_pk, self._counts.get(student_pk, 0))
+        for group in self._memberships.get(student_pk, ()):
+            group.remove(student_pk)
+            group.add(student_pk, rank)
+
+    def exclude(self, student_pk: int) -> None:
+        """reset_exclusions 전까지 모든 그룹에서 학생을 제외 (같은 일정 중복 배정 방지)"""
+        if student_pk in self._excluded:
+            return
+
+        self._excluded.add(student_pk)
+        for group in self._memberships.get(student_pk, ()):
+            group.remove(student_pk)
+
+    def reset_exclusions(self) -> None:
+        for student_pk in self._excluded:
+            rank = self._rank(student_pk, self._counts.get(student_pk, 0))
+            for group in self._memberships.get(student_pk, ()):
+                group.add(student_pk, rank)
+        self._excluded.clear()
@@ -0,0 +1,84 @@
+"""목록 조회 공통 처리: 키셋(after) 페이지네이션, fields 컬럼 선택, 캐시된 전체 개수
+
+limit을 주지 않으면 기존처럼 목록 전체(list)를 반환하되 MAX_UNPAGED_ROWS행을 넘으면 잘라서 주지 않고
+400으로 limit/after 사용을 요구한다. limit을 주면 {items, total, has_more, next_after} 봉투로 반환한다.
+total은 같은 조건의 COUNT를 LIST_COUNT_CACHE_SECONDS 동안 재사용하는 근사치다.
+"""
+import os
+from collections.abc import Mapping
+
+from fastapi import HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Query
+
+from auth.cache import TTLCache
+
+MAX_PAGE_LIMIT = int(os.getenv("MAX_PAGE_LIMIT", "500"))
+LIST_COUNT_CACHE_SECONDS = int(os.getenv("LIST_COUNT_CACHE_SECONDS", "30"))
+MAX_UNPAGED_ROWS = int(os.getenv("MAX_UNPAGED_ROWS", "5000"))
+
+count_cache = TTLCache(ttl_seconds=LIST_COUNT_CACHE_SECONDS, max_size=1024)
+
+
+def select_columns(columns: tuple, fields: str | None, key_column) -> tuple:
+    """fields(쉼표 구분)에 해당하는 컬럼만 고름. 커서로 쓰는 키 컬럼은 항상 포함"""
+    if not fields:
+        return columns
+
+    columns_by_name = {column.key: column for column in columns}
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in columns_by_name]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필드입니다: {', '.join(unknown)}")
+
+    selected = [key_column.key] + [name for name in requested if name != key_column.key]
+    return tuple(columns_by_name[name] for name in dict.fromkeys(selected))
+
+
+def _cached_count(query: Query) -> int:
+    statement = query.order_by(None).statement
+    compiled = statement.compile()
+    cache_key = (str(compiled), tuple(sorted(compiled.params.items(), key=lambda item: item[0])))
+
+    total = count_cache.get(cache_key)
+    if total is None:
+        total = query.order_by(None).count()
+        count_cache.set(cache_key, total)
+    return total
+
+
+def paginate(query: Query, key_column, limit: int | None = None, after: int | None = None):
+    """키 컬럼 오름차순으로 정렬된 query를 after 다음부터 limit개 조회"""
+    if limit is None:
+        if after is not None:
+            query = query.filter(key_column > after)
+        rows = query.limit(MAX_UNPAGED_ROWS + 1).all()
+        if len(rows) > MAX_UNPAGED_ROWS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"조회 결과가 {MAX_UNPAGED_ROWS}건을 넘습니다. limit과 after로 나누어 조회해주세요.",
+            )
+        return rows
+
+    # 전체 개수는 커서 위치와 무관하게 같은 조건으로 셈
+    total = _cached_count(query)
+    if after is not None:
+        query = query.filter(key_column > after)
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": rows,
+        "total": total,
+        "has_more": has_more,
+        "next_after": getattr(rows[-1], key_column.key) if has_more else None,
+    }
+
+
+def projected_response(result, headers: Mapping[str, str] | None = None) -> Response:
+    """fields로 일부 컬럼만 고른 결과는 response_model 검증 없이 그대로 직렬화"""
+    if isinstance(result, Response):
+        return result
+    if isinstance(result, dict):
+        return ORJSONResponse({**result, "items": [row._asdict() for row in result["items"]]}, headers=headers)
+    return ORJSONResponse([row._asdict() for row in result], headers=headers)
@@ -1,12 +1,16 @@
 from datetime import date, timedelta
 
 from fastapi import HTTPException
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from db import models, schemas
-from services import assignments_service
+from db.table_versions import record_entity_changes
+from services import assignment_stats_service, assignments_service, pagination
 
 ALLOWED_SCHEDULE_STATUSES = {"예정", "완료", "취소"}
+LIST_COLUMNS = (models.Schedule.schedule_id, models.Schedule.cleaning_date, models.Schedule.status)
 WEEKDAY_LABELS = {
     0: "월요일",
     1: "화요일",
@@ -28,8 +32,13 @@ def get_schedules(
     schedule_id: int | None = None,
     cleaning_date: date | None = None,
     status: str | None = None,
+    limit: int | None = None,
+    after: int | None = None,
+    fields: str | None = None,
 ):
-    query = db.query(models.Schedule).order_by(models.Schedule.schedule_id)
+    # 목록 응답은 ORM 객체를 만들지 않고 필요한 컬럼만 읽음
+    columns = pagination.select_columns(LIST_COLUMNS, fields, models.Schedule.schedule_id)
+    query = db.query(*columns).order_by(models.Schedule.schedule_id)
 
     if schedule_id is not None:
         matched = query.filter(models.Schedule.schedule_id == schedule_id).all()
@@ -46,7 +55,7 @@ def get_schedules(
     if status is not None:
         query = query.filter(models.Schedule.status == status)
 
-    return query.all()
+    return pagination.paginate(query, models.Schedule.schedule_id, limit=limit, after=after)
 
 
 def _normalize_schedule_weekdays(weekdays: list[int]) -> list[int]:
@@ -66,20 +75,54 @@ def _format_schedule_weekdays(weekdays: list[int]) -> str:
     return ", ".join(WEEKDAY_LABELS[weekday] for weekday in weekdays)
 
 
+def _insert_new_schedules(db: Session, new_dates: list[date]) -> list[int]:
+    """다중 행 INSERT 한 번으로 일정을 만들고 이 요청이 실제로 만든 schedule_id만 반환
+
+    동시에 같은 날짜가 생성된 경우만 unique 충돌로 건너뛰고, 그 밖의 오류는 그대로 올린다.
+    """
+    rows = [{"cleaning_date": target_date, "status": "예정"} for target_date in new_dates]
+
+    if db.get_bind().dialect.name == "mysql":
+        db.execute(
+            mysql_insert(models.Schedule)
+            .values(rows)
+            .on_duplicate_key_update(schedule_id=models.Schedule.schedule_id)
+            .execution_options(record_changes=False)
+        )
+        # MySQL은 RETURNING이 없으므로 다시 읽음. REPEATABLE READ 스냅샷은 existing_dates 조회 때 잡혔으므로
+        # 그 뒤 다른 요청이 커밋한 같은 날짜 행은 보이지 않고(건너뛴 행은 값이 바뀌지 않음) 이 요청이 넣은 행만 읽힘
+        return [
+            schedule_id
+            for (schedule_id,) in db.query(models.Schedule.schedule_id)
+            .filter(models.Schedule.cleaning_date.in_(new_dates))
+            .all()
+        ]
+
+    return list(
+        db.execute(
+            sqlite_insert(models.Schedule)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[models.Schedule.cleaning_date])
+            .returning(models.Schedule.schedule_id)
+            .execution_options(record_changes=False)
+        ).scalars()
+    )
+
+
 def add_schedule(db: Session, start_date: date, end_date: date, weekdays: list[int]):
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦을 수 없습니다.")
 
     normalized_weekdays = _normalize_schedule_weekdays(weekdays)
     weekday_text = _format_schedule_weekdays(normalized_weekdays)
-    selected_weekdays = set(normalized_weekdays)
 
+    # 요일별 첫 날짜부터 7일 간격으로 계산
     matching_dates: list[date] = []
-    current = start_date
-    while current <= end_date:
-        if current.weekday() in selected_weekdays:
-            matching_dates.append(current)
-        current += timedelta(days=1)
+    for weekday in normalized_weekdays:
+        first_date = start_date + timedelta(days=(weekday - start_date.weekday()) % 7)
+        week_count = (end_date - first_date).days // 7 + 1
+        matching_dates.extend(first_date + timedelta(weeks=week) for week in range(week_count))
+    matching_dates.sort()
 
     if not matching_dates:
         raise HTTPException(
@@ -88,33 +131,32 @@ def add_schedule(db: Session, start_date: date, end_date: date, weekdays: list[i
         )
 
     existing_dates = {
-        s.cleaning_date
-        for s in db.query(models.Schedule)
+        cleaning_date
+        for (cleaning_date,) in db.query(models.Schedule.cleaning_date)
         .filter(
             models.Schedule.cleaning_date >= start_date,
             models.Schedule.cleaning_date <= end_date,
         )
         .all()
     }
+    new_dates = [target_date for target_date in matching_dates if target_date not in existing_dates]
 
-    created_schedules: list[models.Schedule] = []
-    for target_date in matching_dates:
-        if target_date in existing_dates:
-            continue
-
-        schedule = models.Schedule(cleaning_date=target_date, status="예정")
-        db.add(schedule)
-        created_schedules.append(schedule)
-
-    if not created_schedules:
+    if not new_dates:
         raise HTTPException(
             status_code=400,
             detail=f"해당 기간의 선택한 요일({weekday_text}) 일정이 이미 모두 등록되어 있습니다.",
         )
 
+    created_schedule_ids = _insert_new_schedules(db, new_dates)
+    record_entity_changes(db, models.Schedule.__tablename__, created_schedule_ids)
     db.commit()
-    for schedule in created_schedules:
-        db.refresh(schedule)
+
+    created_schedules = (
+        db.query(models.Schedule)
+        .filter(models.Schedule.schedule_id.in_(created_schedule_ids))
+        .order_by(models.Schedule.cleaning_date)
+        .all()
+    )
 
     return {
         "message": f"선택한 요일({weekday_text}) 일정이 생성되었습니다.",
@@ -152,6 +194,19 @@ def update_schedule(db: Session, schedule_id: int, update_data: schemas.Schedule
     canceled_trade_count = 0
     if previous_status != "취소" and schedule.status == "취소":
         assignment_ids = assignments_service._get_assignment_ids_for_schedule(db, schedule_id)
+        canceled_rows = (
+            db.query(models.Assignment.student_pk, models.Assignment.status)
+            .filter(
+                models.Assignment.schedule_id == schedule_id,
+                models.Assignment.status != "취소",
+            )
+            .all()
+        )
+        assignment_stats_service.apply_assignment_changes(
+            db,
+            removed=canceled_rows,
+            added=[(student_pk, "취소") for student_pk, _ in canceled_rows],
+        )
         canceled_assignment_count = (
             db.query(models.Assignment)
             .filter(
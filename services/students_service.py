@@ -1,9 +1,20 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from auth.cache import invalidate_principal
 from db import models, schemas
+from services import assignment_stats_service, pagination
 
 CANCELABLE_ASSIGNMENT_STATUSES = ("배정", "불이행")
+# password_hash는 목록 응답에서 제외
+LIST_COLUMNS = (
+    models.Student.student_pk,
+    models.Student.student_id,
+    models.Student.name,
+    models.Student.grade,
+    models.Student.status,
+    models.Student.role,
+)
 
 
 def get_students(
@@ -11,8 +22,13 @@ def get_students(
     student_id: str | None = None,
     grade: int | None = None,
     name: str | None = None,
+    limit: int | None = None,
+    after: int | None = None,
+    fields: str | None = None,
 ):
-    query = db.query(models.Student).order_by(models.Student.student_pk)
+    # 목록 응답은 ORM 객체를 만들지 않고 필요한 컬럼만 읽음
+    columns = pagination.select_columns(LIST_COLUMNS, fields, models.Student.student_pk)
+    query = db.query(*columns).order_by(models.Student.student_pk)
 
     if student_id is not None:
         matched = query.filter(models.Student.student_id == student_id).all()
@@ -27,9 +43,9 @@ def get_students(
         return matched
 
     if grade is not None:
-        return query.filter(models.Student.grade == grade).all()
+        query = query.filter(models.Student.grade == grade)
 
-    return query.all()
+    return pagination.paginate(query, models.Student.student_pk, limit=limit, after=after)
 
 
 def add_student(
@@ -92,11 +108,17 @@ def update_student(db: Session, student_pk: int, update_data: schemas.StudentUpd
             )
             .all()
         )
+        assignment_stats_service.apply_assignment_changes(
+            db,
+            removed=[(assignment.student_pk, assignment.status) for assignment in assignments],
+            added=[(assignment.student_pk, "취소") for assignment in assignments],
+        )
         for assignment in assignments:
             assignment.status = "취소"
             canceled_assignment_ids.append(assignment.assignment_id)
 
     db.commit()
+    invalidate_principal(student_pk)
     db.refresh(student)
 
     return {
@@ -115,7 +137,12 @@ def delete_student(db: Session, student_pk: int):
     if linked_assignment:
         raise HTTPException(status_code=400, detail="배정 이력이 있는 학생은 삭제할 수 없습니다.")
 
+    # 배정이 모두 삭제된 뒤에도 남는 집계 원장 행이 학생을 참조하므로 먼저 삭제
+    db.query(models.StudentAssignmentStats).filter(
+        models.StudentAssignmentStats.student_pk == student_pk
+    ).delete(synchronize_session=False)
     db.delete(student)
     db.commit()
+    invalidate_principal(student_pk)
 
     return {"message": "삭제되었습니다."}
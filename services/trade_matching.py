@@ -0,0 +1,154 @@
+"""대기 중인 교환 요청을 다자간 순환 교환으로 묶는 매칭 알고리즘
+
+교환 요청 (신청 배정 A → 대상 배정 B)를 "A의 학생이 B를 원한다"는 방향 간선으로 보고,
+A1 → A2 → ... → Ak → A1 순환이면 각 학생이 원하는 배정을 받아 모두 만족한다.
+짧은 순환부터 길이 상한까지 차례로, 시작 정점보다 큰 정점만 지나는 깊이 제한 DFS로 찾으며
+(같은 순환을 한 번만 탐색) 채택된 순환의 정점은 이후 탐색에서 제외해 서로소를 보장한다.
+"""
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+TradeEdge = tuple[int, int, int]  # (request_id, 신청 배정 ID, 대상 배정 ID)
+
+
+class RosterState:
+    """순환 교환 검증용 메모리 배정 현황 (배정 소유 학생, 일정별 학생 배정 수)"""
+
+    def __init__(self, assignment_rows, occupancy_rows):
+        self.owners = {assignment_id: student_pk for assignment_id, _, student_pk in assignment_rows}
+        self.schedules = {assignment_id: schedule_id for assignment_id, schedule_id, _ in assignment_rows}
+        self.occupancy = Counter((schedule_id, student_pk) for schedule_id, student_pk in occupancy_rows)
+
+    def try_rotate(self, cycle: list[TradeEdge]) -> bool:
+        """교환 후 같은 일정에 한 학생이 두 번 배정되지 않으면 현황에 반영하고 True"""
+        next_owners = {
+            target_assignment_id: self.owners[requester_assignment_id]
+            for _, requester_assignment_id, target_assignment_id in cycle
+        }
+
+        changes: Counter = Counter()
+        for assignment_id, next_student_pk in next_owners.items():
+            schedule_id = self.schedules[assignment_id]
+            changes[(schedule_id, self.owners[assignment_id])] -= 1
+            changes[(schedule_id, next_student_pk)] += 1
+
+        if any(self.occupancy[key] + delta > 1 for key, delta in changes.items() if delta > 0):
+            return False
+
+        self.occupancy.update(changes)
+        self.owners.update(next_owners)
+        return True
+
+
+def _prune_acyclic(adjacency: dict[int, list[tuple[int, int]]]) -> dict[int, list[tuple[int, int]]]:
+    """들어오거나 나가는 간선이 없는 정점을 반복 제거 (순환에 속할 수 없음)"""
+    in_degrees: dict[int, int] = {node: 0 for node in adjacency}
+    reverse: dict[int, list[int]] = {node: [] for node in adjacency}
+    for node, edges in adjacency.items():
+        for next_node, _ in edges:
+            in_degrees[next_node] += 1
+            reverse[next_node].append(node)
+    out_degrees = {node: len(edges) for node, edges in adjacency.items()}
+
+    removed: set[int] = set()
+    stack = [node for node in adjacency if in_degrees[node] == 0 or out_degrees[node] == 0]
+    while stack:
+        node = stack.pop()
+        if node in removed:
+            continue
+        removed.add(node)
+
+        for next_node, _ in adjacency[node]:
+            in_degrees[next_node] -= 1
+            if in_degrees[next_node] == 0 and next_node not in removed:
+                stack.append(next_node)
+        for previous_node in reverse[node]:
+            out_degrees[previous_node] -= 1
+            if out_degrees[previous_node] == 0 and previous_node not in removed:
+                stack.append(previous_node)
+
+    return {
+        node: [(next_node, request_id) for next_node, request_id in edges if next_node not in removed]
+        for node, edges in adjacency.items()
+        if node not in removed
+    }
+
+
+def find_trade_cycles(
+    edges: Iterable[TradeEdge],
+    max_length: int = 4,
+    accept: Callable[[list[TradeEdge]], bool] | None = None,
+    max_expansions: int = 10_000,
+) -> list[list[TradeEdge]]:
+    """서로소인 교환 순환 목록을 반환
+
+    accept(순환)이 False면 그 순환은 버리고 탐색을 이어간다 (중복 배정 검증 등).
+    max_expansions는 시작 정점 하나당 DFS 확장 횟수 상한으로, 밀집 그래프에서의 폭증을 막는다.
+    """
+    adjacency: dict[int, list[tuple[int, int]]] = {}
+    for request_id, requester_assignment_id, target_assignment_id in edges:
+        adjacency.setdefault(requester_assignment_id, []).append((target_assignment_id, request_id))
+        adjacency.setdefault(target_assignment_id, [])
+    for node_edges in adjacency.values():
+        node_edges.sort()
+
+    adjacency = _prune_acyclic(adjacency)
+    used: set[int] = set()
+    cycles: list[list[TradeEdge]] = []
+
+    for length in range(2, max_length + 1):
+        for start in sorted(adjacency):
+            if start in used:
+                continue
+
+            cycle = _find_cycle_from(adjacency, start, length, used, accept, max_expansions)
+            if cycle is not None:
+                used.update(requester_assignment_id for _, requester_assignment_id, _ in cycle)
+                cycles.append(cycle)
+
+    return cycles
+
+
+def _find_cycle_from(
+    adjacency: dict[int, list[tuple[int, int]]],
+    start: int,
+    length: int,
+    used: set[int],
+    accept: Callable[[list[TradeEdge]], bool] | None,
+    max_expansions: int,
+) -> list[TradeEdge] | None:
+    path: list[TradeEdge] = []
+    on_path = {start}
+    # (정점, 다음에 볼 간선 인덱스) 스택으로 재귀 없이 탐색
+    stack = [(start, 0)]
+    expansions = 0
+
+    while stack:
+        node, edge_index = stack[-1]
+        node_edges = adjacency[node]
+        if edge_index >= len(node_edges) or expansions >= max_expansions:
+            stack.pop()
+            if path:
+                on_path.discard(path.pop()[2])
+            continue
+
+        stack[-1] = (node, edge_index + 1)
+        next_node, request_id = node_edges[edge_index]
+        expansions += 1
+
+        if next_node == start:
+            if len(path) + 1 == length:
+                cycle = [*path, (request_id, node, start)]
+                if accept is None or accept(cycle):
+                    return cycle
+            continue
+
+        # 시작 정점보다 작은 정점을 포함한 순환은 그 정점에서 이미 탐색됨
+        if next_node < start or next_node in used or next_node in on_path or len(path) + 1 >= length:
+            continue
+
+        path.append((request_id, node, next_node))
+        on_path.add(next_node)
+        stack.append((next_node, 0))
+
+    return None
@@ -1,10 +1,19 @@
 from fastapi import HTTPException
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, or_, select, union
+from sqlalchemy.orm import Session, aliased
 
 from db import models, schemas
+from events.broker import publish_after_commit
+from services import assignment_stats_service, pagination
+from services.trade_matching import RosterState, TradeEdge, find_trade_cycles
 
 ALLOWED_TERMINAL_STATUSES = {"수락", "거절", "취소"}
+LIST_COLUMNS = (
+    models.Trade.request_id,
+    models.Trade.requester_assignment_id,
+    models.Trade.target_assignment_id,
+    models.Trade.status,
+)
 
 
 def _get_assignment_or_404(db: Session, assignment_id: int):
@@ -14,64 +23,131 @@ def _get_assignment_or_404(db: Session, assignment_id: int):
     return assignment
 
 
-def _get_trade_or_404(db: Session, request_id: int):
-    trade = db.query(models.Trade).filter(models.Trade.request_id == request_id).first()
+def _get_assignment_owner_pks(db: Session, assignment_ids) -> list[int]:
+    return [
+        student_pk
+        for (student_pk,) in db.query(models.Assignment.student_pk)
+        .filter(models.Assignment.assignment_id.in_(assignment_ids))
+        .all()
+    ]
+
+
+def _get_trade_or_404(db: Session, request_id: int, for_update: bool = False):
+    query = db.query(models.Trade).filter(models.Trade.request_id == request_id)
+    if for_update:
+        query = query.with_for_update().populate_existing()
+
+    trade = query.first()
     if not trade:
         raise HTTPException(status_code=404, detail=f"{request_id}번 교환 요청을 찾을 수 없습니다.")
     return trade
 
 
-def _has_active_assignment(
-    db: Session,
-    schedule_id: int,
-    student_pk: int,
-    excluded_assignment_ids: set[int],
-) -> bool:
-    query = db.query(models.Assignment).filter(
-        models.Assignment.schedule_id == schedule_id,
-        models.Assignment.student_pk == student_pk,
-        models.Assignment.status != "취소",
-    )
-    if excluded_assignment_ids:
-        query = query.filter(models.Assignment.assignment_id.notin_(excluded_assignment_ids))
-    return query.first() is not None
-
-
 def _validate_no_duplicate_after_swap(db: Session, requester_assignment, target_assignment):
     excluded_ids = {requester_assignment.assignment_id, target_assignment.assignment_id}
 
     requester_next_student_pk = target_assignment.student_pk
     target_next_student_pk = requester_assignment.student_pk
 
-    if _has_active_assignment(
-        db=db,
-        schedule_id=requester_assignment.schedule_id,
-        student_pk=requester_next_student_pk,
-        excluded_assignment_ids=excluded_ids,
-    ):
+    # 양쪽 일정의 중복 여부를 한 번의 조회로 확인
+    duplicate_schedule_ids = {
+        schedule_id
+        for (schedule_id,) in db.query(models.Assignment.schedule_id)
+        .filter(
+            models.Assignment.status != "취소",
+            models.Assignment.assignment_id.notin_(excluded_ids),
+            or_(
+                and_(
+                    models.Assignment.schedule_id == requester_assignment.schedule_id,
+                    models.Assignment.student_pk == requester_next_student_pk,
+                ),
+                and_(
+                    models.Assignment.schedule_id == target_assignment.schedule_id,
+                    models.Assignment.student_pk == target_next_student_pk,
+                ),
+            ),
+        )
+        .with_for_update()
+        .all()
+    }
+
+    if requester_assignment.schedule_id in duplicate_schedule_ids:
         raise HTTPException(
             status_code=400,
             detail="교환 후 신청자 일정에 동일 학생이 중복 배정됩니다.",
         )
 
-    if _has_active_assignment(
-        db=db,
-        schedule_id=target_assignment.schedule_id,
-        student_pk=target_next_student_pk,
-        excluded_assignment_ids=excluded_ids,
-    ):
+    if target_assignment.schedule_id in duplicate_schedule_ids:
         raise HTTPException(
             status_code=400,
             detail="교환 후 대상자 일정에 동일 학생이 중복 배정됩니다.",
         )
 
 
+def _get_assignment_pair_or_404(
+    db: Session,
+    requester_assignment_id: int,
+    target_assignment_id: int,
+    for_update: bool = False,
+):
+    query = (
+        db.query(models.Assignment)
+        .filter(models.Assignment.assignment_id.in_([requester_assignment_id, target_assignment_id]))
+        .order_by(models.Assignment.assignment_id)
+    )
+    if for_update:
+        query = query.with_for_update().populate_existing()
+
+    assignments = {assignment.assignment_id: assignment for assignment in query.all()}
+    for assignment_id in (requester_assignment_id, target_assignment_id):
+        if assignment_id not in assignments:
+            raise HTTPException(status_code=404, detail=f"{assignment_id}번 배정을 찾을 수 없습니다.")
+
+    return assignments[requester_assignment_id], assignments[target_assignment_id]
+
+
+def _lock_assignment_pair(db: Session, requester_assignment_id: int, target_assignment_id: int):
+    """두 학생 행 → 두 배정 행 순서(각각 PK 오름차순)로 잠가 같은 학생이 걸린 교환끼리 직렬화
+
+    교환 요청 행은 항상 이 잠금 뒤에 잡으므로 동시 요청 간 잠금 순서가 뒤바뀌지 않는다.
+    """
+    requester_assignment, target_assignment = _get_assignment_pair_or_404(
+        db,
+        requester_assignment_id,
+        target_assignment_id,
+    )
+    student_pks = (requester_assignment.student_pk, target_assignment.student_pk)
+
+    (
+        db.query(models.Student.student_pk)
+        .filter(models.Student.student_pk.in_(student_pks))
+        .order_by(models.Student.student_pk)
+        .with_for_update()
+        .all()
+    )
+    requester_assignment, target_assignment = _get_assignment_pair_or_404(
+        db,
+        requester_assignment_id,
+        target_assignment_id,
+        for_update=True,
+    )
+
+    # 잠금 전에 다른 요청이 배정 학생을 바꿨다면 잠근 학생과 달라지므로 재시도를 요청
+    if (requester_assignment.student_pk, target_assignment.student_pk) != student_pks:
+        raise HTTPException(status_code=409, detail="다른 요청으로 배정이 변경되었습니다. 다시 시도해 주세요.")
+
+    return requester_assignment, target_assignment
+
+
 def _validate_trade_pair(db: Session, requester_assignment_id: int, target_assignment_id: int):
     if requester_assignment_id == target_assignment_id:
         raise HTTPException(status_code=400, detail="동일한 배정끼리는 교환할 수 없습니다.")
 
-    requester_assignment = _get_assignment_or_404(db, requester_assignment_id)
-    target_assignment = _get_assignment_or_404(db, target_assignment_id)
+    requester_assignment, target_assignment = _lock_assignment_pair(
+        db,
+        requester_assignment_id,
+        target_assignment_id,
+    )
 
     if requester_assignment.status == "취소" or target_assignment.status == "취소":
         raise HTTPException(status_code=400, detail="취소된 배정은 교환할 수 없습니다.")
@@ -84,33 +160,153 @@ def _validate_trade_pair(db: Session, requester_assignment_id: int, target_assig
     return requester_assignment, target_assignment
 
 
+def get_trade_candidates(db: Session, assignment_id: int, limit: int = 50, offset: int = 0):
+    requester_assignment = _get_assignment_or_404(db, assignment_id)
+    requester_grade = (
+        db.query(models.Student.grade).filter(models.Student.student_pk == requester_assignment.student_pk).scalar()
+    )
+
+    candidate = aliased(models.Assignment)
+    duplicate = aliased(models.Assignment)
+
+    # 교환 후 중복 배정이 생기는 후보는 제외 (양쪽 일정 모두 확인)
+    requester_duplicate_exists = (
+        exists()
+        .where(
+            duplicate.schedule_id == candidate.schedule_id,
+            duplicate.student_pk == requester_assignment.student_pk,
+            duplicate.status != "취소",
+            duplicate.assignment_id != candidate.assignment_id,
+            duplicate.assignment_id != requester_assignment.assignment_id,
+        )
+    )
+    target_duplicate_exists = (
+        exists()
+        .where(
+            duplicate.schedule_id == requester_assignment.schedule_id,
+            duplicate.student_pk == candidate.student_pk,
+            duplicate.status != "취소",
+            duplicate.assignment_id != candidate.assignment_id,
+            duplicate.assignment_id != requester_assignment.assignment_id,
+        )
+    )
+    pending_trade_exists = exists().where(
+        models.Trade.status == "대기",
+        or_(
+            and_(
+                models.Trade.requester_assignment_id == requester_assignment.assignment_id,
+                models.Trade.target_assignment_id == candidate.assignment_id,
+            ),
+            and_(
+                models.Trade.requester_assignment_id == candidate.assignment_id,
+                models.Trade.target_assignment_id == requester_assignment.assignment_id,
+            ),
+        ),
+    )
+
+    rows = (
+        db.query(candidate, models.Schedule.cleaning_date, models.Student.name, models.Area.name)
+        .join(models.Schedule, models.Schedule.schedule_id == candidate.schedule_id)
+        .join(models.Student, models.Student.student_pk == candidate.student_pk)
+        .join(models.Area, models.Area.area_id == candidate.area_id)
+        .join(
+            models.AreaTargetGrade,
+            and_(
+                models.AreaTargetGrade.area_id == candidate.area_id,
+                models.AreaTargetGrade.grade == requester_grade,
+            ),
+        )
+        .filter(
+            models.Schedule.status == "예정",
+            candidate.status == "배정",
+            candidate.schedule_id != requester_assignment.schedule_id,
+            candidate.student_pk != requester_assignment.student_pk,
+            ~requester_duplicate_exists,
+            ~target_duplicate_exists,
+            ~pending_trade_exists,
+        )
+        .order_by(models.Schedule.cleaning_date, candidate.assignment_id)
+        .offset(offset)
+        .limit(limit + 1)
+        .all()
+    )
+
+    return {
+        "assignment_id": assignment_id,
+        "limit": limit,
+        "offset": offset,
+        "has_more": len(rows) > limit,
+        "items": [
+            {
+                "assignment_id": assignment.assignment_id,
+                "schedule_id": assignment.schedule_id,
+                "cleaning_date": cleaning_date,
+                "student_pk": assignment.student_pk,
+                "student_name": student_name,
+                "area_id": assignment.area_id,
+                "area_name": area_name,
+                "status": assignment.status,
+            }
+            for assignment, cleaning_date, student_name, area_name in rows[:limit]
+        ],
+    }
+
+
 def get_trades(
     db: Session,
     request_id: int | None = None,
     requester_assignment_id: int | None = None,
     target_assignment_id: int | None = None,
     status: str | None = None,
+    student_pk: int | None = None,
+    limit: int | None = None,
+    after: int | None = None,
+    fields: str | None = None,
 ):
-    query = db.query(models.Trade).order_by(models.Trade.request_id)
+    # 요청 번호 조회는 다른 조건을 무시하고 해당 요청만 반환
+    if request_id is not None:
+        criteria = [models.Trade.request_id == request_id]
+    else:
+        criteria = []
+        if requester_assignment_id is not None:
+            criteria.append(models.Trade.requester_assignment_id == requester_assignment_id)
+        if target_assignment_id is not None:
+            criteria.append(models.Trade.target_assignment_id == target_assignment_id)
+        if status is not None:
+            criteria.append(models.Trade.status == status)
+
+    # 목록 응답은 ORM 객체를 만들지 않고 필요한 컬럼만 읽음
+    # (fields로 고른 컬럼만 UNION 결과에 남으므로 조건은 UNION 전에 양쪽에 적용)
+    trade_columns = pagination.select_columns(LIST_COLUMNS, fields, models.Trade.request_id)
+    query = db.query(*trade_columns).filter(*criteria)
+
+    # 학생 본인의 교환만: 신청/대상 배정 각각과 조인한 결과를 합침 (OR 조인 대신 인덱스를 타는 UNION)
+    if student_pk is not None:
+        requester_trades = (
+            db.query(*trade_columns)
+            .join(models.Assignment, models.Assignment.assignment_id == models.Trade.requester_assignment_id)
+            .filter(models.Assignment.student_pk == student_pk, *criteria)
+        )
+        target_trades = (
+            db.query(*trade_columns)
+            .join(models.Assignment, models.Assignment.assignment_id == models.Trade.target_assignment_id)
+            .filter(models.Assignment.student_pk == student_pk, *criteria)
+        )
+        query = requester_trades.union(target_trades)
+
+    query = query.order_by(models.Trade.request_id)
 
     if request_id is not None:
-        matched = query.filter(models.Trade.request_id == request_id).all()
+        matched = query.all()
         if not matched:
             raise HTTPException(status_code=404, detail="해당 교환 요청이 존재하지 않습니다.")
         return matched
 
-    if requester_assignment_id is not None:
-        query = query.filter(models.Trade.requester_assignment_id == requester_assignment_id)
-    if target_assignment_id is not None:
-        query = query.filter(models.Trade.target_assignment_id == target_assignment_id)
-    if status is not None:
-        query = query.filter(models.Trade.status == status)
-
-    return query.all()
+    return pagination.paginate(query, models.Trade.request_id, limit=limit, after=after)
 
 
 def add_trade(db: Session, requester_assignment_id: int, target_assignment_id: int):
-    _validate_trade_pair(db, requester_assignment_id, target_assignment_id)
+    requester_assignment, target_assignment = _validate_trade_pair(db, requester_assignment_id, target_assignment_id)
 
     existing_trade = (
         db.query(models.Trade)
@@ -127,6 +323,7 @@ def add_trade(db: Session, requester_assignment_id: int, target_assignment_id: i
                 ),
             ),
         )
+        .with_for_update()
         .first()
     )
     if existing_trade:
@@ -138,6 +335,14 @@ def add_trade(db: Session, requester_assignment_id: int, target_assignment_id: i
         status="대기",
     )
     db.add(trade)
+    db.flush()
+    publish_after_commit(
+        db,
+        (requester_assignment.student_pk, target_assignment.student_pk),
+        "trade.created",
+        request_id=trade.request_id,
+        status=trade.status,
+    )
     db.commit()
     db.refresh(trade)
 
@@ -160,12 +365,37 @@ def update_trade_status(db: Session, request_id: int, update_data: schemas.Trade
             trade.requester_assignment_id,
             trade.target_assignment_id,
         )
+
+    # 잠금 순서(학생 → 배정 → 교환 요청)를 지키도록 교환 요청 행은 마지막에 잠그고 상태를 다시 확인
+    trade = _get_trade_or_404(db, request_id, for_update=True)
+    if trade.status != "대기":
+        raise HTTPException(status_code=400, detail="대기 중인 요청만 처리할 수 있습니다.")
+
+    if next_status == "수락":
+        assignment_stats_service.apply_assignment_changes(
+            db,
+            removed=[
+                (requester_assignment.student_pk, requester_assignment.status),
+                (target_assignment.student_pk, target_assignment.status),
+            ],
+            added=[
+                (target_assignment.student_pk, requester_assignment.status),
+                (requester_assignment.student_pk, target_assignment.status),
+            ],
+        )
         requester_assignment.student_pk, target_assignment.student_pk = (
             target_assignment.student_pk,
             requester_assignment.student_pk,
         )
 
     trade.status = next_status
+    publish_after_commit(
+        db,
+        _get_assignment_owner_pks(db, (trade.requester_assignment_id, trade.target_assignment_id)),
+        "trade.updated",
+        request_id=request_id,
+        status=next_status,
+    )
     db.commit()
     db.refresh(trade)
 
@@ -177,3 +407,145 @@ def delete_trade(db: Session, request_id: int):
     db.delete(trade)
     db.commit()
     return {"message": "교환 요청이 삭제되었습니다."}
+
+
+def _load_roster_state(db: Session, assignment_ids, for_update: bool = False) -> RosterState:
+    """배정 ID 목록(또는 서브쿼리)의 취소되지 않은 배정과, 그 일정들의 학생별 배정 현황을 조회"""
+    assignment_query = db.query(
+        models.Assignment.assignment_id,
+        models.Assignment.schedule_id,
+        models.Assignment.student_pk,
+    ).filter(models.Assignment.assignment_id.in_(assignment_ids), models.Assignment.status != "취소")
+    occupancy_query = db.query(models.Assignment.schedule_id, models.Assignment.student_pk).filter(
+        models.Assignment.schedule_id.in_(
+            select(models.Assignment.schedule_id).where(models.Assignment.assignment_id.in_(assignment_ids))
+        ),
+        models.Assignment.status != "취소",
+    )
+    if for_update:
+        occupancy_query = occupancy_query.with_for_update()
+
+    return RosterState(assignment_query.all(), occupancy_query.all())
+
+
+def _lock_cycle_rows(db: Session, cycles: list[list[TradeEdge]], owners: dict[int, int]):
+    """학생 → 배정 → 교환 요청 순서(각각 PK 오름차순)로 순환에 걸린 행을 잠금"""
+    assignment_ids = sorted({assignment_id for cycle in cycles for _, assignment_id, _ in cycle})
+    request_ids = sorted(request_id for cycle in cycles for request_id, _, _ in cycle)
+    student_pks = sorted({owners[assignment_id] for assignment_id in assignment_ids})
+
+    (
+        db.query(models.Student.student_pk)
+        .filter(models.Student.student_pk.in_(student_pks))
+        .order_by(models.Student.student_pk)
+        .with_for_update()
+        .all()
+    )
+    assignments = {
+        assignment.assignment_id: assignment
+        for assignment in db.query(models.Assignment)
+        .filter(models.Assignment.assignment_id.in_(assignment_ids))
+        .order_by(models.Assignment.assignment_id)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    }
+    trades = {
+        trade.request_id: trade
+        for trade in db.query(models.Trade)
+        .filter(models.Trade.request_id.in_(request_ids))
+        .order_by(models.Trade.request_id)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    }
+    return assignments, trades
+
+
+def _format_cycle(cycle: list[TradeEdge], owners: dict[int, int]):
+    return {
+        "request_ids": [request_id for request_id, _, _ in cycle],
+        "moves": [
+            {
+                "assignment_id": target_assignment_id,
+                "from_student_pk": owners[target_assignment_id],
+                "to_student_pk": owners[requester_assignment_id],
+            }
+            for _, requester_assignment_id, target_assignment_id in cycle
+        ],
+    }
+
+
+def match_trade_cycles(db: Session, max_length: int = 4, dry_run: bool = False):
+    pending_assignment_ids = union(
+        select(models.Trade.requester_assignment_id).where(models.Trade.status == "대기"),
+        select(models.Trade.target_assignment_id).where(models.Trade.status == "대기"),
+    )
+    roster = _load_roster_state(db, pending_assignment_ids)
+    owners = dict(roster.owners)
+
+    # 취소된 배정이 걸린 요청은 그래프에서 제외
+    edges = [
+        (request_id, requester_assignment_id, target_assignment_id)
+        for request_id, requester_assignment_id, target_assignment_id in db.query(
+            models.Trade.request_id,
+            models.Trade.requester_assignment_id,
+            models.Trade.target_assignment_id,
+        )
+        .filter(models.Trade.status == "대기")
+        .all()
+        if requester_assignment_id in owners and target_assignment_id in owners
+    ]
+    cycles = find_trade_cycles(edges, max_length=max_length, accept=roster.try_rotate)
+
+    if dry_run or not cycles:
+        return {
+            "message": "교환 순환 매칭 결과입니다." if dry_run else "성립한 교환 순환이 없습니다.",
+            "dry_run": dry_run,
+            "pending_count": len(edges),
+            "cycles": [_format_cycle(cycle, owners) for cycle in cycles],
+            "skipped_count": 0,
+        }
+
+    # 잠금 후 최신 상태로 다시 검증해, 그사이 바뀐 순환은 건너뜀
+    assignments, trades = _lock_cycle_rows(db, cycles, owners)
+    locked_roster = _load_roster_state(db, sorted(assignments), for_update=True)
+
+    executed_cycles: list[list[TradeEdge]] = []
+    for cycle in cycles:
+        unchanged = all(
+            trades.get(request_id) is not None
+            and trades[request_id].status == "대기"
+            and locked_roster.owners.get(requester_assignment_id) == owners[requester_assignment_id]
+            for request_id, requester_assignment_id, _ in cycle
+        )
+        if unchanged and locked_roster.try_rotate(cycle):
+            executed_cycles.append(cycle)
+
+    removed: list[tuple[int, str]] = []
+    added: list[tuple[int, str]] = []
+    for cycle in executed_cycles:
+        for request_id, requester_assignment_id, target_assignment_id in cycle:
+            target_assignment = assignments[target_assignment_id]
+            removed.append((target_assignment.student_pk, target_assignment.status))
+            added.append((owners[requester_assignment_id], target_assignment.status))
+            target_assignment.student_pk = owners[requester_assignment_id]
+            trades[request_id].status = "수락"
+            publish_after_commit(
+                db,
+                (owners[requester_assignment_id], owners[target_assignment_id]),
+                "trade.updated",
+                request_id=request_id,
+                status="수락",
+            )
+
+    assignment_stats_service.apply_assignment_changes(db, removed=removed, added=added)
+    db.commit()
+
+    return {
+        "message": f"{len(executed_cycles)}개의 교환 순환을 처리했습니다.",
+        "dry_run": dry_run,
+        "pending_count": len(edges),
+        "cycles": [_format_cycle(cycle, owners) for cycle in executed_cycles],
+        "skipped_count": len(cycles) - len(executed_cycles),
+    }
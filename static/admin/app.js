@@ -7,7 +7,7 @@ if (user.role !== "관리자") { window.location.href = "/user"; throw new Error
 document.getElementById("userInfo").textContent = `${user.name} (${user.role})`;
 
 // ===== 상태 =====
-const state = { students: [], areas: [], schedules: [], assignments: [], trades: [] };
+const state = { students: [], areas: [], schedules: [], assignments: [], trades: [], studentNames: {} };
 
 // ===== 유틸 =====
 const alertEl = document.getElementById("alert");
@@ -19,8 +19,10 @@ function showAlert(msg, type = "error") {
 }
 
 function studentName(pk) {
+  // 학생 목록은 페이지 단위로 받으므로 아직 받지 않은 학생은 이름 목록으로 표시
   const s = state.students.find(s => s.student_pk === pk);
-  return s ? `${s.name}(${s.student_id})` : `#${pk}`;
+  if (s) return `${s.name}(${s.student_id})`;
+  return state.studentNames[pk] ? escapeHtml(state.studentNames[pk]) : `#${pk}`;
 }
 function areaName(id) {
   const a = state.areas.find(a => a.area_id === id);
@@ -42,26 +44,125 @@ document.querySelectorAll(".tab").forEach(tab => {
 });
 
 // ===== 데이터 로드 =====
+// 목록은 키셋 페이지(PAGE_SIZE개)로 표에 쓰는 컬럼만 받고, 나머지는 "더 보기"로 이어서 받음
+const PAGE_SIZE = 200;
+// path: 조회 경로, idKey: 커서/정렬 키, fields: 받을 컬럼(없으면 페이지 없이 전체), complete: 모든 페이지를 미리 받음
+const ENTITIES = {
+  students: { path: "/students/", idKey: "student_pk", fields: "student_id,name,grade,status,role" },
+  areas: { path: "/areas/", idKey: "area_id" },
+  // 일정은 선택 목록과 날짜 표시에 모두 필요하고 하루 한 건이라 전부 받음
+  schedules: { path: "/schedules/", idKey: "schedule_id", fields: "cleaning_date,status", complete: true },
+  assignments: { path: "/assignments/", idKey: "assignment_id", fields: "schedule_id,student_pk,area_id,status" },
+  trades: { path: "/trades/", idKey: "request_id", fields: "requester_assignment_id,target_assignment_id,status" },
+};
+// 엔티티 → { nextAfter, hasMore, total }
+const pages = {};
+let changeCursor = null;
+
+function entityQuery(entity) {
+  // 배정은 선택한 일정으로 서버에서 거름
+  const schId = document.getElementById("assignmentFilterSchedule").value;
+  return entity === "assignments" && schId ? { schedule_id: schId } : {};
+}
+
+function matchesQuery(entity, row) {
+  return Object.entries(entityQuery(entity)).every(([key, value]) => String(row[key]) === String(value));
+}
+
+async function fetchPage(entity, after) {
+  const { path, fields } = ENTITIES[entity];
+  const query = { ...entityQuery(entity), limit: PAGE_SIZE, fields };
+  if (after !== null) query.after = after;
+  const page = await api("GET", path, { query });
+  pages[entity] = { nextAfter: page.next_after, hasMore: page.has_more, total: page.total };
+  return page.items;
+}
+
+// 첫 페이지부터 다시 받음 (complete면 마지막 페이지까지)
+async function loadEntity(entity) {
+  const { path, fields, complete } = ENTITIES[entity];
+  if (!fields) {
+    state[entity] = (await api("GET", path)) || [];
+    return;
+  }
+  let rows = await fetchPage(entity, null);
+  while (complete && pages[entity].hasMore) {
+    rows = rows.concat(await fetchPage(entity, pages[entity].nextAfter));
+  }
+  state[entity] = rows;
+}
+
+async function loadMore(entity) {
+  try {
+    state[entity] = state[entity].concat(await fetchPage(entity, pages[entity].nextAfter));
+    renderAll();
+  } catch (err) {
+    showAlert("데이터 로드 실패: " + err.message);
+  }
+}
+
 async function loadAll() {
   try {
-    const [students, areas, schedules, assignments, trades] = await Promise.all([
-      api("GET", "/students/"),
-      api("GET", "/areas/"),
-      api("GET", "/schedules/"),
-      api("GET", "/assignments/"),
-      api("GET", "/trades/"),
+    // 전체 조회 전에 커서를 받아 두어 조회 중에 생긴 변경도 다음 동기화에서 반영
+    changeCursor = (await api("GET", "/changes")).cursor;
+    const [studentNames] = await Promise.all([
+      api("GET", "/students/names"),
+      ...Object.keys(ENTITIES).map(loadEntity),
     ]);
-    state.students = students || [];
-    state.areas = areas || [];
-    state.schedules = schedules || [];
-    state.assignments = assignments || [];
-    state.trades = trades || [];
+    state.studentNames = studentNames || {};
     renderAll();
   } catch (err) {
     showAlert("데이터 로드 실패: " + err.message);
   }
 }
 
+// 변경된 행을 받은 범위 안에서만 반영 (아직 받지 않은 뒤쪽 행은 "더 보기"로 받음)
+function mergeRows(entity, upserts, deletes) {
+  const { idKey } = ENTITIES[entity];
+  const page = pages[entity];
+  const loadedUpTo = page && page.hasMore ? page.nextAfter : Infinity;
+  const removed = new Set([...deletes, ...upserts.map(row => row[idKey])]);
+  const visible = upserts.filter(row => row[idKey] <= loadedUpTo && matchesQuery(entity, row));
+  state[entity] = state[entity]
+    .filter(row => !removed.has(row[idKey]))
+    .concat(visible)
+    .sort((a, b) => a[idKey] - b[idKey]);
+}
+
+// 변경 후에는 전체 재조회 대신 커서 이후 바뀐 행만 받아 상태에 반영
+async function syncChanges() {
+  if (changeCursor === null) return loadAll();
+  try {
+    let page;
+    do {
+      page = await api("GET", "/changes", { query: { since: changeCursor } });
+      for (const entity of page.resets) {
+        await loadEntity(entity);
+      }
+      for (const entity of Object.keys(ENTITIES)) {
+        if (page.resets.includes(entity)) continue;
+        mergeRows(entity, page.upserts[entity], page.deletes[entity] || []);
+      }
+      for (const student of page.upserts.students) {
+        state.studentNames[student.student_pk] = student.name;
+      }
+      changeCursor = page.cursor;
+    } while (page.has_more);
+    renderAll();
+  } catch (err) {
+    showAlert("데이터 동기화 실패: " + err.message);
+  }
+}
+
+function renderLoadMore(entity) {
+  const el = document.getElementById(entity + "More");
+  const page = pages[entity];
+  el.innerHTML = page && page.hasMore
+    ? `<span>${state[entity].length}건 표시 (전체 약 ${page.total}건)</span>
+       <button class="btn btn-sm btn-outline" onclick="loadMore('${entity}')">더 보기</button>`
+    : "";
+}
+
 function renderAll() {
   renderStudents();
   renderAreas();
@@ -69,6 +170,7 @@ function renderAll() {
   renderAssignments();
   renderTrades();
   syncSelectors();
+  ["students", "assignments", "trades"].forEach(renderLoadMore);
 }
 
 // ===== 학생 렌더링 =====
@@ -176,11 +278,22 @@ function renderTrades() {
 // ===== 셀렉터 동기화 =====
 function syncSelectors() {
   const schOpts = state.schedules.map(s => `<option value="${s.schedule_id}">${s.cleaning_date} (${s.status})</option>`).join("");
-  document.getElementById("deleteScheduleSelect").innerHTML = `<option value="">일정 선택...</option>` + schOpts;
-  document.getElementById("assignmentFilterSchedule").innerHTML = `<option value="">전체 일정</option>` + schOpts;
+  // 다시 그려도 선택한 일정이 유지되도록 값을 복원
+  for (const [id, placeholder] of [["deleteScheduleSelect", "일정 선택..."], ["assignmentFilterSchedule", "전체 일정"]]) {
+    const select = document.getElementById(id);
+    const selected = select.value;
+    select.innerHTML = `<option value="">${placeholder}</option>` + schOpts;
+    select.value = state.schedules.some(s => String(s.schedule_id) === selected) ? selected : "";
+  }
 }
 
-document.getElementById("assignmentFilterSchedule").addEventListener("change", renderAssignments);
+// 일정 필터는 서버에서 거른 배정 첫 페이지를 다시 받음
+document.getElementById("assignmentFilterSchedule").addEventListener("change", async () => {
+  try {
+    await loadEntity("assignments");
+    renderAll();
+  } catch (err) { showAlert("데이터 로드 실패: " + err.message); }
+});
 
 // ===== CRUD 액션 =====
 
@@ -197,7 +310,7 @@ document.getElementById("addStudentForm").addEventListener("submit", async (e) =
     }});
     e.target.reset();
     showAlert("학생이 등록되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -213,7 +326,7 @@ document.getElementById("addAreaForm").addEventListener("submit", async (e) => {
     }});
     e.target.reset();
     showAlert("구역이 등록되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -238,7 +351,7 @@ document.getElementById("addScheduleForm").addEventListener("submit", async (e)
     }});
     e.target.reset();
     showAlert("일정이 생성되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -253,7 +366,7 @@ document.getElementById("addTradeForm").addEventListener("submit", async (e) =>
     }});
     e.target.reset();
     showAlert("교환 요청이 등록되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -262,7 +375,18 @@ document.getElementById("autoAssignBtn").addEventListener("click", async () => {
   try {
     const result = await api("POST", "/assignments/");
     showAlert("자동 배정이 완료되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
+  } catch (err) { showAlert(err.message); }
+});
+
+// 취소된 배정 일괄 재배정 (일정 미선택 시 전체 예정 일정)
+document.getElementById("reassignCanceledBtn").addEventListener("click", async () => {
+  const schId = document.getElementById("deleteScheduleSelect").value;
+  try {
+    const result = await api("POST", "/assignments/reassign", { query: { schedule_id: schId } });
+    const type = result.failed_count > 0 ? "error" : "success";
+    showAlert(`재배정 ${result.reassigned_count}건 완료, 실패 ${result.failed_count}건`, type);
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -274,7 +398,7 @@ document.getElementById("deleteAssignmentsBtn").addEventListener("click", async
   try {
     await api("DELETE", "/assignments/", { query: { schedule_id: schId } });
     showAlert("배정이 삭제되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -284,7 +408,7 @@ document.getElementById("deleteAllSchedulesBtn").addEventListener("click", async
   try {
     await api("DELETE", "/schedules/");
     showAlert("전체 일정이 삭제되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -294,34 +418,34 @@ document.getElementById("deleteAllAssignmentsBtn").addEventListener("click", asy
   try {
     await api("DELETE", "/assignments/");
     showAlert("전체 배정이 삭제되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
 // 개별 삭제 함수들
 async function deleteStudent(pk) {
   if (!confirm("이 학생을 삭제하시겠습니까?")) return;
-  try { await api("DELETE", `/students/${pk}`); showAlert("삭제되었습니다.", "success"); await loadAll(); }
+  try { await api("DELETE", `/students/${pk}`); showAlert("삭제되었습니다.", "success"); await syncChanges(); }
   catch (err) { showAlert(err.message); }
 }
 async function deleteArea(id) {
   if (!confirm("이 구역을 삭제하시겠습니까?")) return;
-  try { await api("DELETE", `/areas/${id}`); showAlert("삭제되었습니다.", "success"); await loadAll(); }
+  try { await api("DELETE", `/areas/${id}`); showAlert("삭제되었습니다.", "success"); await syncChanges(); }
   catch (err) { showAlert(err.message); }
 }
 async function deleteSchedule(id) {
   if (!confirm("이 일정을 삭제하시겠습니까? 관련 배정도 삭제됩니다.")) return;
-  try { await api("DELETE", `/schedules/${id}`); showAlert("삭제되었습니다.", "success"); await loadAll(); }
+  try { await api("DELETE", `/schedules/${id}`); showAlert("삭제되었습니다.", "success"); await syncChanges(); }
   catch (err) { showAlert(err.message); }
 }
 async function deleteAssignment(id) {
   if (!confirm("이 배정을 삭제하시겠습니까?")) return;
-  try { await api("DELETE", `/assignments/${id}`); showAlert("삭제되었습니다.", "success"); await loadAll(); }
+  try { await api("DELETE", `/assignments/${id}`); showAlert("삭제되었습니다.", "success"); await syncChanges(); }
   catch (err) { showAlert(err.message); }
 }
 async function deleteTrade(id) {
   if (!confirm("이 교환 요청을 삭제하시겠습니까?")) return;
-  try { await api("DELETE", `/trades/${id}`); showAlert("삭제되었습니다.", "success"); await loadAll(); }
+  try { await api("DELETE", `/trades/${id}`); showAlert("삭제되었습니다.", "success"); await syncChanges(); }
   catch (err) { showAlert(err.message); }
 }
 
@@ -331,7 +455,7 @@ async function updateAssignmentStatus(id, status) {
   try {
     await api("PATCH", `/assignments/${id}/status`, { query: { status } });
     showAlert("상태가 변경되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 }
 
@@ -340,7 +464,7 @@ async function reassignAssignment(id) {
   try {
     await api("POST", `/assignments/${id}/reassign`);
     showAlert("재배정이 완료되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 }
 
@@ -349,7 +473,7 @@ async function updateTrade(id, status) {
   try {
     await api("PATCH", `/trades/${id}`, { body: { status } });
     showAlert(`교환이 ${status}되었습니다.`, "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 }
 
@@ -387,7 +511,7 @@ document.getElementById("editSubmitBtn").addEventListener("click", async () => {
     await editContext(data);
     closeModal();
     showAlert("수정되었습니다.", "success");
-    await loadAll();
+    await syncChanges();
   } catch (err) { showAlert(err.message); }
 });
 
@@ -4,8 +4,7 @@ if (!requireAuth()) throw new Error("Not authenticated");
 const user = getStoredUser();
 document.getElementById("userInfo").textContent = `${user.name} (${user.student_id})`;
 
-const state = { myAssignments: [], areas: [], schedules: [], trades: [], peerAssignments: [], studentNames: {} };
-const myPk = user.student_pk;
+const state = { myAssignments: [], areas: [], schedules: [], trades: [], counterpartAssignments: [], peerAssignments: [], candidateAssignmentId: null, studentNames: {} };
 const peerAssignmentsBody = document.getElementById("peerAssignments");
 const targetAssignmentInput = document.getElementById("targetAssignmentId");
 
@@ -28,6 +27,10 @@ function scheduleDate(id) {
   const s = state.schedules.find(s => s.schedule_id === id);
   return s ? s.cleaning_date : `#${id}`;
 }
+function counterpartLabel(id) {
+  const a = state.counterpartAssignments.find(a => a.assignment_id === id);
+  return a ? `${studentName(a.student_pk)} · ${scheduleDate(a.schedule_id)} · ${areaName(a.area_id)}` : "";
+}
 
 function renderTradeCandidateMessage(message) {
   peerAssignmentsBody.innerHTML = `<tr><td colspan="6" class="empty-state">${message}</td></tr>`;
@@ -35,6 +38,7 @@ function renderTradeCandidateMessage(message) {
 
 function resetTradeCandidates(message = "내 배정을 선택하면 다른 일정의 교환 가능 배정을 볼 수 있습니다.") {
   state.peerAssignments = [];
+  state.candidateAssignmentId = null;
   targetAssignmentInput.value = "";
   renderTradeCandidateMessage(message);
 }
@@ -42,24 +46,14 @@ function resetTradeCandidates(message = "내 배정을 선택하면 다른 일
 // ===== 데이터 로드 =====
 async function loadAll() {
   try {
-    const [assignments, areas, schedules, trades, studentNames] = await Promise.all([
-      api("GET", "/assignments/", { query: { student_pk: myPk } }),
-      api("GET", "/areas/"),
-      api("GET", "/schedules/"),
-      api("GET", "/trades/"),
-      api("GET", "/students/names"),
-    ]);
-    state.myAssignments = assignments || [];
-    state.areas = areas || [];
-    state.schedules = schedules || [];
-    state.studentNames = studentNames || {};
-
-    // 내 배정 ID 목록
-    const myAssignmentIds = new Set(state.myAssignments.map(a => a.assignment_id));
-    // 나와 관련된 교환만 필터
-    state.trades = (trades || []).filter(t =>
-      myAssignmentIds.has(t.requester_assignment_id) || myAssignmentIds.has(t.target_assignment_id)
-    );
+    // 내 배정·교환과 그들이 참조하는 일정·구역·학생 이름만 한 번에 조회
+    const dashboard = await api("GET", "/me/dashboard");
+    state.myAssignments = dashboard.assignments;
+    state.areas = dashboard.areas;
+    state.schedules = dashboard.schedules;
+    state.studentNames = dashboard.student_names;
+    state.trades = dashboard.trades;
+    state.counterpartAssignments = dashboard.counterpart_assignments;
 
     renderAll();
   } catch (err) {
@@ -103,6 +97,40 @@ function selectTradeTarget(assignmentId) {
   targetAssignmentInput.value = assignmentId;
 }
 
+const TRADE_CANDIDATE_PAGE_SIZE = 50;
+
+function renderTradeCandidates(hasMore) {
+  if (state.peerAssignments.length === 0) {
+    renderTradeCandidateMessage("교환 가능한 다른 일정 배정이 없습니다.");
+    return;
+  }
+
+  peerAssignmentsBody.innerHTML = state.peerAssignments.map(a => `<tr>
+    <td>${a.assignment_id}</td>
+    <td>${escapeHtml(a.student_name)}</td>
+    <td>${a.cleaning_date}</td>
+    <td>${escapeHtml(a.area_name)}</td>
+    <td>${statusBadge(a.status)}</td>
+    <td><button type="button" class="btn btn-sm btn-outline" onclick="selectTradeTarget(${a.assignment_id})">선택</button></td>
+  </tr>`).join("") + (hasMore
+    ? `<tr><td colspan="6" class="empty-state"><button type="button" class="btn btn-sm btn-outline" onclick="loadTradeCandidates(${state.candidateAssignmentId}, ${state.peerAssignments.length})">더 보기</button></td></tr>`
+    : "");
+}
+
+// 서버에서 교환 가능한(중복·대기 중 요청이 없는) 후보만 페이지 단위로 조회
+async function loadTradeCandidates(assignmentId, offset = 0) {
+  try {
+    const page = await api("GET", "/trades/candidates", {
+      query: { assignment_id: assignmentId, limit: TRADE_CANDIDATE_PAGE_SIZE, offset },
+    });
+    if (state.candidateAssignmentId !== assignmentId) return;
+    state.peerAssignments = offset === 0 ? page.items : state.peerAssignments.concat(page.items);
+    renderTradeCandidates(page.has_more);
+  } catch (err) {
+    renderTradeCandidateMessage("조회 실패");
+  }
+}
+
 // 배정 선택 시 다른 일정 교환 후보 보기
 document.getElementById("myAssignmentSelect").addEventListener("change", async (e) => {
   const assignmentId = parseInt(e.target.value);
@@ -117,32 +145,8 @@ document.getElementById("myAssignmentSelect").addEventListener("change", async (
     return;
   }
 
-  try {
-    const peers = await api("GET", "/assignments/", { query: { status: "배정" } });
-    const others = (peers || []).filter(a => {
-      if (a.assignment_id === myAssignment.assignment_id) return false;
-      if (a.student_pk === myPk || a.status === "취소") return false;
-      if (a.schedule_id === myAssignment.schedule_id) return false;
-      const area = state.areas.find(ar => ar.area_id === a.area_id);
-      return area && area.target_grades.includes(user.grade);
-    });
-    state.peerAssignments = others;
-
-    if (others.length === 0) {
-      renderTradeCandidateMessage("교환 가능한 다른 일정 배정이 없습니다.");
-    } else {
-      peerAssignmentsBody.innerHTML = others.map(a => `<tr>
-        <td>${a.assignment_id}</td>
-        <td>${studentName(a.student_pk)}</td>
-        <td>${scheduleDate(a.schedule_id)}</td>
-        <td>${areaName(a.area_id)}</td>
-        <td>${statusBadge(a.status)}</td>
-        <td><button type="button" class="btn btn-sm btn-outline" onclick="selectTradeTarget(${a.assignment_id})">선택</button></td>
-      </tr>`).join("");
-    }
-  } catch (err) {
-    renderTradeCandidateMessage("조회 실패");
-  }
+  state.candidateAssignmentId = assignmentId;
+  await loadTradeCandidates(assignmentId);
 });
 
 // ===== 내 교환 내역 =====
@@ -178,7 +182,7 @@ function renderMyTrades() {
     return `<tr>
       <td>${t.request_id}</td>
       <td>${myId}</td>
-      <td>${otherId}</td>
+      <td>${otherId} <small>${escapeHtml(counterpartLabel(otherId))}</small></td>
       <td>${direction}</td>
       <td>${statusBadge(t.status)}</td>
       <td>${actions}</td>
@@ -222,5 +226,41 @@ async function respondTrade(requestId, status) {
   } catch (err) { showAlert(err.message); }
 }
 
+// ===== 실시간 알림 =====
+// 내 교환·배정이 바뀌면 서버가 SSE로 알려 주므로 새로고침 없이 다시 조회
+const EVENT_MESSAGES = {
+  "trade.created": "새 교환 요청이 있습니다.",
+  "trade.updated": "교환 요청 상태가 변경되었습니다.",
+  "trades.canceled": "배정 취소로 교환 요청이 취소되었습니다.",
+  "assignment.updated": "청소 현황이 변경되었습니다.",
+  "assignment.reassigned": "배정이 변경되었습니다.",
+};
+let reloadTimer = null;
+
+function scheduleReload() {
+  // 한 번의 처리로 여러 이벤트가 와도 한 번만 다시 조회
+  clearTimeout(reloadTimer);
+  reloadTimer = setTimeout(loadAll, 300);
+}
+
+function connectEvents() {
+  const source = new EventSource(`/events/stream?token=${encodeURIComponent(getToken())}`);
+  for (const [type, message] of Object.entries(EVENT_MESSAGES)) {
+    source.addEventListener(type, () => {
+      showAlert(message, "success");
+      scheduleReload();
+    });
+  }
+  // 토큰 만료 시 서버가 스트림을 닫으므로 재연결하지 않음
+  source.addEventListener("expired", () => source.close());
+  // 끊긴 동안 놓친 알림이 있을 수 있으므로 재연결되면 전체를 다시 조회
+  let connectedOnce = false;
+  source.addEventListener("open", () => {
+    if (connectedOnce) scheduleReload();
+    connectedOnce = true;
+  });
+}
+
 // ===== 초기 로드 =====
 loadAll();
+connectEvents();